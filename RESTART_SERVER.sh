@@ -12,7 +12,12 @@ sleep 3
 
 # Start fresh
 source venv/bin/activate
+# gevent workers: the proxy endpoints (/api/location/from-ip, /api/google/*)
+# spend almost all their time blocked on external HTTP calls, so an event-loop
+# worker multiplexes far more concurrent requests than threaded sync workers.
 nohup gunicorn --workers 3 \
+    --worker-class gevent \
+    --worker-connections 1000 \
     --bind 0.0.0.0:5001 \
     --certfile=ssl/cert.pem \
     --keyfile=ssl/key.pem \
@@ -4,17 +4,36 @@ Provides web interface for the blind navigation application
 """
 import logging
 import os
-from flask import Flask, request, jsonify, render_template, make_response, send_file
+import re
+import time
+from flask import Flask, Response, request, jsonify, render_template, make_response, send_file
+from cachetools import LRUCache, TTLCache
 from flask_cors import CORS
+from flask_compress import Compress
 from navigation_controller import NavigationController
 from config import Config
+import orjson
 import requests
+import requests_cache
+from requests.adapters import HTTPAdapter, Retry
 import threading
+import queue
+import hashlib
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
+import numpy as np
 from uuid import uuid4
 import io
-import os
 import json
-import base64
+# pybase64 wraps libbase64's SIMD (AVX2/SSSE3) encoder - 5-10x faster than
+# stdlib base64 on the per-frame vision JPEGs - with an identical API
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+import types
 from datetime import datetime
 
 # Load environment variables from .env file
@@ -25,14 +44,36 @@ try:
     logger.info("✅ Environment variables loaded from .env file")
 except ImportError:
     pass  # dotenv not installed, env vars must be set manually
-try:
-    from PIL import Image
-except Exception:
-    Image = None
-try:
-    from gtts import gTTS
-except Exception:
-    gTTS = None
+# Heavy optional dependencies (Pillow is ~10 MB of RSS on import) are loaded
+# lazily on first use so API-only processes don't pay for them at startup.
+_Image = None
+
+def _get_image_module():
+    """Return PIL.Image, importing it on first call, or None if unavailable."""
+    global _Image
+    if _Image is None:
+        try:
+            from PIL import Image
+            # Refuse decompression bombs before the decoder allocates for
+            # them; 20 MP is far above any legitimate vision frame
+            Image.MAX_IMAGE_PIXELS = 20_000_000
+            _Image = Image
+        except Exception:
+            _Image = False
+    return _Image or None
+
+_gTTS = None
+
+def _get_gtts():
+    """Return the gTTS class, importing it on first call, or None if unavailable."""
+    global _gTTS
+    if _gTTS is None:
+        try:
+            from gtts import gTTS
+            _gTTS = gTTS
+        except Exception:
+            _gTTS = False
+    return _gTTS or None
 
 # Optional Google Places
 from services.google_places_service import GooglePlacesService
@@ -51,14 +92,80 @@ app.config.from_object(Config)
 # Enable CORS for frontend access
 CORS(app)
 
-# Per-session navigation controllers
-controllers = {}
-controllers_lock = threading.Lock()
+# Compress responses: route JSON carries hundreds of polyline coordinates
+# (tens of kB per poll) that compress 5-10x; mobile clients save the
+# bandwidth and extra TCP round trips
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+
+# Hard cap on request bodies: the only large uploads are vision frames, which
+# are well under this after client-side capture. Werkzeug rejects oversized
+# requests at the WSGI layer before anything buffers or decodes them.
+MAX_UPLOAD_BYTES = 4 * 1024 * 1024
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+
+# Per-session navigation controllers.
+# Reads are lock-free (dict lookups are atomic under the GIL); only creation
+# takes a lock, striped by session id so new sessions don't all serialize
+# behind a single global mutex.
+# The map is LRU-bounded: every page load can mint a new sid, and without a
+# cap stale controllers (each holding threads, HTTP sessions and caches)
+# accumulate forever.
+MAX_SESSIONS = int(os.getenv('MAX_SESSIONS', 1000))
+SESSION_IDLE_TIMEOUT = int(os.getenv('SESSION_IDLE_TIMEOUT', 1800))  # seconds
+
+class _ControllerLRU(LRUCache):
+    """LRU session map that stops evicted controllers to release resources."""
+
+    def popitem(self):
+        sid, ctrl = super().popitem()
+        logger.info(f"Evicting least-recently-used session {sid}")
+        _release_controller(sid, ctrl)
+        return sid, ctrl
+
+# Pool of stopped controllers available for reuse: constructing a
+# NavigationController wires up half a dozen services and is the slowest
+# part of a session's first request, so evicted controllers are reset and
+# recycled instead of rebuilt from scratch.
+_controller_pool = queue.LifoQueue(maxsize=64)
+
+def _obtain_controller():
+    """Get a controller for a new session, reusing a pooled one if possible."""
+    try:
+        ctrl = _controller_pool.get_nowait()
+        ctrl.reset()
+        return ctrl
+    except queue.Empty:
+        pass
+    except Exception as e:
+        logger.error(f"Error reusing pooled controller: {str(e)}")
+    return NavigationController(test_mode=False)
+
+def _release_controller(sid, ctrl):
+    """Stop a controller being dropped from the session map."""
+    try:
+        ctrl.stop()
+    except Exception as e:
+        logger.error(f"Error stopping controller for session {sid}: {str(e)}")
+    VISION_STATE.pop(sid, None)
+    try:
+        _controller_pool.put_nowait(ctrl)
+    except queue.Full:
+        pass
 
-# Request caching to reduce redundant processing
-request_cache = {}
+controllers = _ControllerLRU(maxsize=MAX_SESSIONS)
+_CONTROLLER_LOCK_STRIPES = 16
+_controller_locks = [threading.Lock() for _ in range(_CONTROLLER_LOCK_STRIPES)]
+
+# Request caching to reduce redundant processing.
+# TTLCache bounds the cache size and evicts anything older than the hard cap;
+# per-entry expiry is a monotonic deadline so a read costs one float compare
+# instead of datetime arithmetic.
+CACHE_DURATION = 2  # seconds (default per-entry TTL)
+_CACHE_MAX_AGE = 600  # seconds before any entry is evicted outright
+request_cache = TTLCache(maxsize=10_000, ttl=_CACHE_MAX_AGE)
 cache_lock = threading.Lock()
-CACHE_DURATION = 2  # seconds
 
 def _get_sid(create_if_missing: bool = False) -> str:
     sid = (
@@ -72,43 +179,261 @@ def _get_sid(create_if_missing: bool = False) -> str:
 
 def _get_controller(create: bool = False):
     sid = _get_sid(create_if_missing=create)
-    logger.info(f"_get_controller called - create: {create}, sid: {sid}")
     if not sid:
         logger.warning("No session ID available")
         return None, None
-    with controllers_lock:
+    # Fast path: plain dict read, no lock needed under the GIL
+    ctrl = controllers.get(sid)
+    if ctrl is not None or not create:
+        if ctrl is not None:
+            ctrl.last_activity = time.monotonic()
+        return sid, ctrl
+    # Slow path: create under a striped lock so concurrent first requests
+    # for the same session build only one controller
+    lock = _controller_locks[hash(sid) % _CONTROLLER_LOCK_STRIPES]
+    with lock:
         ctrl = controllers.get(sid)
-        logger.info(f"Controller lookup - sid: {sid}, found: {ctrl is not None}")
-        if not ctrl and create:
+        if not ctrl:
             logger.info(f"Creating new controller for session {sid}")
-            ctrl = NavigationController(test_mode=False)
-            controllers[sid] = ctrl
+            ctrl = controllers.setdefault(sid, _obtain_controller())
             logger.info(f"Controller created and stored for session {sid}")
+    ctrl.last_activity = time.monotonic()
     return sid, ctrl
 
+def _reap_idle_sessions():
+    """Background sweep evicting sessions idle longer than the timeout."""
+    while True:
+        time.sleep(60)
+        try:
+            now = time.monotonic()
+            for sid in list(controllers.keys()):
+                ctrl = controllers.get(sid)
+                if ctrl is None or (now - getattr(ctrl, 'last_activity', now)) <= SESSION_IDLE_TIMEOUT:
+                    continue
+                # Pop before any switch point (logging does gevent I/O) and
+                # release only what we actually removed, or an LRU eviction
+                # racing us would push the same controller into the pool twice
+                popped = controllers.pop(sid, None)
+                if popped is not ctrl:
+                    if popped is not None:
+                        # a fresh controller took the slot meanwhile; restore it
+                        controllers.setdefault(sid, popped)
+                    continue
+                logger.info(f"Evicting idle session {sid}")
+                _release_controller(sid, ctrl)
+        except Exception as e:
+            logger.error(f"Error reaping idle sessions: {str(e)}")
+
+_session_reaper = threading.Thread(target=_reap_idle_sessions, daemon=True, name='session-reaper')
+_session_reaper.start()
+
 def _get_cached_response(cache_key: str):
     """Get cached response if still valid"""
     with cache_lock:
-        if cache_key in request_cache:
-            entry = request_cache[cache_key]
-            # Support both old (data, ts) and new (data, ts, ttl) formats
-            if isinstance(entry, tuple) and len(entry) == 3:
-                cached_data, timestamp, ttl = entry
-                ttl = ttl or CACHE_DURATION
-            else:
-                cached_data, timestamp = entry
-                ttl = CACHE_DURATION
-            if (datetime.now() - timestamp).total_seconds() < ttl:
-                return cached_data
-            else:
-                # Remove expired cache
-                del request_cache[cache_key]
+        entry = request_cache.get(cache_key)
+    if entry is None:
+        return None
+    cached_data, expires_at = entry
+    if time.monotonic() < expires_at:
+        return cached_data
+    # Remove expired cache
+    with cache_lock:
+        request_cache.pop(cache_key, None)
     return None
 
 def _cache_response(cache_key: str, response_data, duration: int = None):
     """Cache response data"""
+    expires_at = time.monotonic() + (duration or CACHE_DURATION)
     with cache_lock:
-        request_cache[cache_key] = (response_data, datetime.now(), duration or CACHE_DURATION)
+        request_cache[cache_key] = (response_data, expires_at)
+
+def _json_response(payload: bytes, status: int = 200) -> Response:
+    """Build a JSON response from pre-serialized bytes (no re-encode)."""
+    return Response(payload, status=status, mimetype='application/json')
+
+def ojsonify(obj, status: int = 200) -> Response:
+    """
+    Drop-in jsonify replacement backed by orjson's C encoder.
+
+    Route payloads can contain hundreds of coordinate points; orjson
+    serializes them several times faster than stdlib json and emits bytes
+    directly, skipping the separate UTF-8 encode step.
+    """
+    return _json_response(orjson.dumps(obj), status)
+
+# Coalescing of concurrent identical cache misses: clients poll the same
+# endpoints at ~1 Hz per session, so two near-simultaneous misses for the
+# same key would otherwise both recompute. The first caller computes, any
+# overlapping callers wait on its Future.
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _coalesced_response(cache_key: str, producer, duration: int = None):
+    """
+    Return the cached value for cache_key, computing it via producer()
+    at most once across concurrent callers and caching the result.
+    """
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        return cached
+    with _inflight_lock:
+        fut = _inflight.get(cache_key)
+        if fut is None:
+            fut = Future()
+            _inflight[cache_key] = fut
+            is_owner = True
+        else:
+            is_owner = False
+    if not is_owner:
+        return fut.result(timeout=5)
+    try:
+        value = producer()
+        _cache_response(cache_key, value, duration)
+        fut.set_result(value)
+        return value
+    except Exception as e:
+        fut.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(cache_key, None)
+
+def _coalesced_json_response(cache_key: str, producer, duration: int = None) -> Response:
+    """
+    Coalesced + cached JSON endpoint helper.
+
+    Caches the orjson-serialized bytes rather than the Python dict, so every
+    cache hit ships the stored bytes without re-encoding.
+    """
+    payload = _coalesced_response(cache_key, lambda: orjson.dumps(producer()), duration)
+    return _json_response(payload)
+
+# Routing-mode aliases accepted by /api/routing-mode, frozen at module load
+# so the handler does one hash lookup instead of rebuilding the table
+_MODE_ALIASES = types.MappingProxyType({
+    'foot': 'foot',
+    'walk': 'foot',
+    'walking': 'foot',
+    'car': 'car',
+    'drive': 'car',
+    'driving': 'car',
+    'vehicle': 'car',
+})
+
+# Navigation-intent phrases compiled into one case-insensitive DFA scan,
+# replacing three separate substring searches plus a .lower() allocation
+NAV_INTENT_RE = re.compile(r'\b(?:go|navigate|take me) to\b', re.IGNORECASE)
+
+# Shared outbound HTTP session with transparent response caching (SQLite).
+# Repeated identical lookups (same IP, same Places request) are answered from
+# cache in sub-millisecond time instead of re-paying a 200-1000 ms round trip;
+# Places data barely changes, so googleapis responses keep a much longer TTL
+# than IP-geolocation ones.
+os.makedirs(Config.CACHE_DIR, exist_ok=True)
+HTTP = requests_cache.CachedSession(
+    os.path.join(Config.CACHE_DIR, 'http_cache'),
+    backend='sqlite',
+    expire_after=600,
+    urls_expire_after={'*.googleapis.com': 86400},
+)
+# Large keep-alive pool so repeat calls to the geolocation/Places hosts skip
+# the 100-300 ms TCP+TLS handshake; one quick retry smooths over transient
+# provider hiccups without stacking up latency.
+_http_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=128,
+    max_retries=Retry(total=1, backoff_factor=0.1),
+)
+HTTP.mount('https://', _http_adapter)
+HTTP.mount('http://', _http_adapter)
+
+# Process-wide GooglePlacesService instances, one per API key: each one
+# owns a googlemaps client with its own connection pool, so building a new
+# one per request threw away warm connections.
+_places_services = {}
+
+def _get_places_service(api_key):
+    gps = _places_services.get(api_key)
+    if gps is None:
+        gps = _places_services.setdefault(api_key, GooglePlacesService(api_key, requests_session=HTTP))
+    return gps
+
+# IP geolocation: race all providers in parallel and take the first answer
+_IP_LOOKUP_POOL = ThreadPoolExecutor(max_workers=6, thread_name_prefix='ip-geo')
+IP_GEO_CACHE_DURATION = 600  # seconds to remember a resolved IP location
+
+def _fetch_ipapi(client_ip):
+    """Look up (lat, lng) via ipapi.co; returns None on failure."""
+    url = f'https://ipapi.co/{client_ip}/json/' if client_ip else 'https://ipapi.co/json/'
+    resp = HTTP.get(url, timeout=5)
+    if resp.ok:
+        data = orjson.loads(resp.content)
+        lat = data.get('latitude') or data.get('lat')
+        lng = data.get('longitude') or data.get('lng')
+        if lat is not None and lng is not None:
+            return float(lat), float(lng)
+    return None
+
+def _fetch_ipwho(client_ip):
+    """Look up (lat, lng) via ipwho.is; returns None on failure."""
+    url = f'https://ipwho.is/{client_ip}' if client_ip else 'https://ipwho.is/'
+    resp = HTTP.get(url, timeout=5)
+    if resp.ok:
+        data = orjson.loads(resp.content)
+        if data.get('success', True):
+            lat = data.get('latitude')
+            lng = data.get('longitude')
+            if lat is not None and lng is not None:
+                return float(lat), float(lng)
+    return None
+
+def _fetch_ipinfo(client_ip):
+    """Look up (lat, lng) via ipinfo.io (parses the 'loc' field); returns None on failure."""
+    url = f'https://ipinfo.io/{client_ip}/json' if client_ip else 'https://ipinfo.io/json'
+    resp = HTTP.get(url, timeout=5)
+    if resp.ok:
+        data = orjson.loads(resp.content)
+        if 'loc' in data:
+            lat_str, lng_str = data['loc'].split(',')
+            return float(lat_str), float(lng_str)
+    return None
+
+def _geolocate_ip(client_ip):
+    """
+    Resolve an IP to (lat, lng) by racing all providers concurrently.
+
+    The three providers used to be tried serially with a 5 s timeout each
+    (worst case 15 s); firing them in parallel makes latency the fastest
+    provider's instead of the sum. Results are cached per IP.
+    """
+    cache_key = f"ip_geo_{client_ip}"
+    cached = _get_cached_response(cache_key)
+    if cached:
+        logger.info(f"IP geolocation cache hit for {client_ip or 'self'}")
+        return cached
+
+    futures = [
+        _IP_LOOKUP_POOL.submit(fetch, client_ip)
+        for fetch in (_fetch_ipapi, _fetch_ipwho, _fetch_ipinfo)
+    ]
+    result = None
+    try:
+        for future in as_completed(futures, timeout=6):
+            try:
+                result = future.result()
+            except Exception:
+                continue
+            if result:
+                break
+    except Exception:
+        pass  # overall timeout - fall through with whatever we have
+    finally:
+        for future in futures:
+            future.cancel()
+
+    if result:
+        _cache_response(cache_key, result, duration=IP_GEO_CACHE_DURATION)
+    return result
 
 def initialize_navigation():
     """Ensure a controller exists for this session"""
@@ -223,50 +548,11 @@ def set_location_from_ip():
         xff = request.headers.get('X-Forwarded-For', '')
         client_ip = (xff.split(',')[0].strip() if xff else request.remote_addr) or ''
         
-        # Query IP geolocation service
-        # Use ipapi.co which supports specifying the IP in the path
-        # Try ipapi.co
-        url = f'https://ipapi.co/{client_ip}/json/' if client_ip else 'https://ipapi.co/json/'
-        lat = lng = None
-        try:
-            resp = requests.get(url, timeout=5)
-            if resp.ok:
-                data = resp.json()
-                lat = data.get('latitude') or data.get('lat')
-                lng = data.get('longitude') or data.get('lng')
-        except Exception:
-            pass
-        
-        # Fallback to ipwho.is (no key required)
-        if lat is None or lng is None:
-            try:
-                url2 = f'https://ipwho.is/{client_ip}' if client_ip else 'https://ipwho.is/'
-                resp2 = requests.get(url2, timeout=5)
-                if resp2.ok:
-                    d2 = resp2.json()
-                    if d2.get('success', True):
-                        lat = d2.get('latitude')
-                        lng = d2.get('longitude')
-            except Exception:
-                pass
-        
-        # Fallback to ipinfo.io (parse loc field)
-        if lat is None or lng is None:
-            try:
-                url3 = f'https://ipinfo.io/{client_ip}/json' if client_ip else 'https://ipinfo.io/json'
-                resp3 = requests.get(url3, timeout=5)
-                if resp3.ok:
-                    d3 = resp3.json()
-                    if 'loc' in d3:
-                        loc = d3['loc']
-                        lat_str, lng_str = loc.split(',')
-                        lat = float(lat_str)
-                        lng = float(lng_str)
-            except Exception:
-                pass
-        
-        if lat is None or lng is None:
+        # Race all geolocation providers concurrently; first usable answer wins
+        location = _geolocate_ip(client_ip)
+        if not location:
             return jsonify({'success': False, 'message': 'Could not determine location from IP'}), 502
+        lat, lng = location
         
         success = ctrl.set_current_location(float(lat), float(lng))
         return jsonify({
@@ -296,7 +582,7 @@ def get_status():
         status = ctrl.get_status()
         status['initialized'] = True
         status['session_id'] = sid
-        return jsonify(status)
+        return ojsonify(status)
     except Exception as e:
         logger.error(f"Error getting status: {str(e)}")
         return jsonify({'initialized': False, 'error': str(e)}), 500
@@ -309,7 +595,7 @@ def get_favorites():
         if not ctrl:
             return jsonify({'success': False, 'message': 'Navigation system not initialized'}), 400
         favorites = ctrl.location_manager.get_favorites()
-        return jsonify({'success': True, 'favorites': favorites})
+        return ojsonify({'success': True, 'favorites': favorites})
         
     except Exception as e:
         logger.error(f"Error getting favorites: {str(e)}")
@@ -345,7 +631,7 @@ def get_history():
         limit = request.args.get('limit', 10, type=int)
         action = request.args.get('action', None)
         history = ctrl.location_manager.get_recent_history(limit=limit, action=action)
-        return jsonify({'success': True, 'history': history})
+        return ojsonify({'success': True, 'history': history})
         
     except Exception as e:
         logger.error(f"Error getting history: {str(e)}")
@@ -417,7 +703,7 @@ def process_text_command():
         if not command_text:
             return jsonify({'success': False, 'message': 'Command cannot be empty'}), 400
         logger.info(f"Processing text command: {command_text}")
-        is_navigation_command = any(phrase in command_text.lower() for phrase in ['go to', 'navigate to', 'take me to'])
+        is_navigation_command = NAV_INTENT_RE.search(command_text) is not None
         ctrl._handle_voice_command(command_text)
         status = ctrl.get_status()
         if is_navigation_command and status.get('waiting_for_selection') and status.get('search_results'):
@@ -434,67 +720,48 @@ def process_text_command():
 
 @app.route('/api/navigation/current-instruction', methods=['GET'])
 def get_current_navigation_instruction():
-    """Get current navigation instruction (per session)"""
+    """
+    Get current navigation instruction (per session).
+
+    Sessions must be created via /api/start; a poll for an unknown session
+    returns 404 immediately rather than constructing a controller here,
+    which kept the hot path free of heavyweight object creation.
+    """
     try:
         sid, ctrl = _get_controller(create=False)
-        
-        # Check cache first to reduce redundant processing
-        cache_key = f"instruction_{sid}"
-        cached_response = _get_cached_response(cache_key)
-        if cached_response:
-            logger.info(f"Returning cached instruction for session {sid}")
-            return jsonify(cached_response)
-        
-        logger.info(f"Current instruction request - Session ID: {sid}, Controller exists: {ctrl is not None}")
-        
+
         if not ctrl:
-            # Try to recreate the controller if it's missing
-            logger.warning(f"Controller missing for session {sid}, attempting to recreate...")
-            _, ctrl = _get_controller(create=True)
-            if not ctrl:
-                response = {'success': False, 'message': 'Navigation system not initialized'}
-                return jsonify(response), 400
-        
-        if not ctrl.is_navigating:
-            logger.info(f"Navigation not active for session {sid}")
-            response = {'success': False, 'message': 'No active navigation'}
-            _cache_response(cache_key, response)
-            return jsonify(response)
-        
-        instruction = ctrl.navigation_service.get_current_instruction()
-        logger.info(f"Got instruction for session {sid}: {instruction is not None}")
-        
-        if instruction:
-            # Apply narration improvement for blind users to all navigation instructions
+            return jsonify({'success': False, 'message': 'Navigation session not found'}), 404
+
+        def _produce_instruction_response():
+            if not ctrl.is_navigating:
+                logger.info(f"Navigation not active for session {sid}")
+                return {'success': False, 'message': 'No active navigation'}
+
+            instruction = ctrl.navigation_service.get_current_instruction()
+            logger.info(f"Got instruction for session {sid}: {instruction is not None}")
+
+            if not instruction:
+                return {'success': False, 'message': 'No current instruction available'}
+
+            # Apply narration improvement for blind users to all navigation
+            # instructions (memoized - instructions repeat between steps)
             if isinstance(instruction, dict):
                 original_speech = instruction.get('speech_instruction', '')
                 original_instruction = instruction.get('instruction', '')
-                
-                # Improve both speech and text instructions
+
                 if original_speech:
-                    improved_speech = improve_narration_for_blind_users(original_speech)
-                    improved_speech = add_intersection_guidance(improved_speech, instruction)
-                    instruction['speech_instruction'] = improved_speech
-                
+                    instruction['speech_instruction'] = _improve_instruction_text(original_speech)
+
                 if original_instruction:
-                    improved_instruction = improve_narration_for_blind_users(original_instruction)
-                    improved_instruction = add_intersection_guidance(improved_instruction, instruction)
-                    instruction['instruction'] = improved_instruction
-            
-            response = {
-                'success': True,
-                'instruction': instruction
-            }
-            _cache_response(cache_key, response)
-            return jsonify(response)
-        else:
-            response = {
-                'success': False,
-                'message': 'No current instruction available'
-            }
-            _cache_response(cache_key, response)
-            return jsonify(response)
-        
+                    instruction['instruction'] = _improve_instruction_text(original_instruction)
+
+            return {'success': True, 'instruction': instruction}
+
+        # Cached + coalesced: concurrent polls for the same session share
+        # one computation instead of each hitting the navigation service
+        return _coalesced_json_response(f"instruction_{sid}", _produce_instruction_response)
+
     except Exception as e:
         logger.error(f"Error getting navigation instruction: {str(e)}")
         return jsonify({
@@ -502,6 +769,46 @@ def get_current_navigation_instruction():
             'message': f'Error getting instruction: {str(e)}'
         }), 500
 
+@app.route('/api/navigation/stream', methods=['GET'])
+def navigation_stream():
+    """
+    Server-Sent Events stream of navigation instructions (per session).
+
+    Instead of the browser polling /api/navigation/current-instruction every
+    second, an EventSource on this endpoint receives a push only when the
+    controller announces a new instruction, so server work scales with
+    instruction changes rather than wall-clock ticks. The polling endpoint
+    stays available for compatibility.
+    """
+    _, ctrl = _get_controller(create=False)
+    if not ctrl:
+        return jsonify({'success': False, 'message': 'Navigation system not initialized'}), 400
+
+    def generate():
+        last_sent = None
+        while True:
+            signalled = ctrl.instruction_event.wait(timeout=15)
+            ctrl.instruction_event.clear()
+            if not ctrl.is_navigating:
+                yield 'event: end\ndata: {}\n\n'
+                break
+            instruction = ctrl.navigation_service.get_current_instruction()
+            if instruction:
+                payload = json.dumps({'success': True, 'instruction': instruction})
+                if payload != last_sent:
+                    yield f'data: {payload}\n\n'
+                    last_sent = payload
+                    continue
+            if not signalled:
+                # Periodic comment keeps proxies from closing the idle stream
+                yield ': keep-alive\n\n'
+
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/navigation/route', methods=['GET'])
 def get_current_route():
     """Get current navigation route data for map display (per session)"""
@@ -514,28 +821,29 @@ def get_current_route():
         if not ctrl.is_navigating:
             logger.info(f"[ROUTE] No active navigation - sid={sid}")
             return jsonify({'success': False, 'message': 'No active navigation'})
-        route_data = ctrl.navigation_service.current_route
-        steps_count = (len(route_data.get('instructions', [])) if isinstance(route_data, dict) else 0) if route_data else 0
-        logger.info(f"[ROUTE] Route present={route_data is not None}, steps={steps_count} - sid={sid}")
-        
-        if route_data:
-            try:
-                total_distance = route_data.get('total_distance') if isinstance(route_data, dict) else None
-                total_duration = route_data.get('total_duration') if isinstance(route_data, dict) else None
-                logger.info(f"[ROUTE] Returning route - distance={total_distance}, duration={total_duration}, steps={steps_count} - sid={sid}")
-            except Exception:
-                pass
-            return jsonify({
-                'success': True,
-                'route': route_data
-            })
-        else:
-            logger.info(f"[ROUTE] No current route available - sid={sid}")
-            return jsonify({
-                'success': False,
-                'message': 'No current route available'
-            })
-        
+
+        def _produce_route_response():
+            route_data = ctrl.navigation_service.current_route
+            steps_count = (len(route_data.get('instructions', [])) if isinstance(route_data, dict) else 0) if route_data else 0
+            logger.info(f"[ROUTE] Route present={route_data is not None}, steps={steps_count} - sid={sid}")
+
+            if route_data:
+                try:
+                    total_distance = route_data.get('total_distance') if isinstance(route_data, dict) else None
+                    total_duration = route_data.get('total_duration') if isinstance(route_data, dict) else None
+                    logger.info(f"[ROUTE] Returning route - distance={total_distance}, duration={total_duration}, steps={steps_count} - sid={sid}")
+                except Exception:
+                    pass
+                return {'success': True, 'route': route_data}
+            else:
+                logger.info(f"[ROUTE] No current route available - sid={sid}")
+                return {'success': False, 'message': 'No current route available'}
+
+        # Route data only changes on reroute, so concurrent polls share one
+        # lookup and a brief cache window; the serialized bytes are cached
+        # because encoding the full polyline is the expensive part
+        return _coalesced_json_response(f"route_{sid}", _produce_route_response)
+
     except Exception as e:
         logger.error(f"Error getting navigation route: {str(e)}")
         return jsonify({
@@ -566,7 +874,6 @@ def advance_instruction():
 def health_check():
     """Health check endpoint"""
     try:
-        from datetime import datetime
         _, ctrl = _get_controller(create=False)
         health_status = {
             'status': 'healthy',
@@ -601,10 +908,12 @@ def google_search():
         radius = int(data.get('radius', 5000))
         if not query:
             return jsonify({'success': False, 'message': 'query is required'}), 400
-        gps = GooglePlacesService(api_key)
+        gps = _get_places_service(api_key)
         results = gps.search_places(query=query, location=current_location, radius=radius)
-        # Populate controller selection state so existing UI can select 1..n
-        with controllers_lock:
+        # Populate controller selection state so existing UI can select 1..n.
+        # Per-controller lock keeps the pair of writes atomic without
+        # serializing unrelated sessions behind the global map lock.
+        with ctrl._state_lock:
             ctrl.search_results = results
             ctrl.waiting_for_selection = True
         return jsonify({'success': True, 'results': results, 'provider': 'google'})
@@ -622,25 +931,16 @@ def set_routing_mode():
         
         data = request.get_json(silent=True) or {}
         mode = data.get('mode', 'foot').lower()
-        
-        # Validate mode
-        valid_modes = {
-            'foot': 'foot',
-            'walk': 'foot',
-            'walking': 'foot',
-            'car': 'car',
-            'drive': 'car',
-            'driving': 'car',
-            'vehicle': 'car'
-        }
-        
-        if mode not in valid_modes:
+
+        # Validate mode against the frozen alias table
+        canonical_mode = _MODE_ALIASES.get(mode)
+        if canonical_mode is None:
             return jsonify({
                 'success': False,
                 'message': f'Invalid mode: {mode}. Use "walking" or "driving"'
             }), 400
-        
-        ctrl.routing_mode = valid_modes[mode]
+
+        ctrl.routing_mode = canonical_mode
         mode_name = 'Walking' if ctrl.routing_mode == 'foot' else 'Driving'
         
         logger.info(f"Routing mode changed to: {ctrl.routing_mode} ({mode_name})")
@@ -709,7 +1009,7 @@ def google_navigate():
                     'message': 'Current location not available. Please allow location access and try again.'
                 }), 400
         if place_id:
-            gps = GooglePlacesService(api_key)
+            gps = _get_places_service(api_key)
             det = gps.get_place_details(place_id)
             if not det:
                 return jsonify({'success': False, 'message': 'place not found'}), 404
@@ -732,7 +1032,49 @@ def google_navigate():
         logger.error(f"Google navigate error: {str(e)}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
-VISION_STATE = {}
+# Per-session vision state, LRU-bounded like the controller map
+VISION_STATE = LRUCache(maxsize=MAX_SESSIONS)
+
+# Consecutive frames from a stationary or slow-walking pedestrian are near
+# identical, so Grok results are cached per session keyed by a perceptual
+# hash of the frame. A tolerant (hamming distance) match skips the multi
+# second vision round trip entirely.
+_VISION_GUIDANCE_CACHE = LRUCache(maxsize=MAX_SESSIONS)  # sid -> deque of entries
+_VISION_GUIDANCE_TTL = 10.0       # seconds an entry stays valid
+_VISION_GUIDANCE_PER_SESSION = 8  # recent frames remembered per session
+_VISION_HAMMING_TOLERANCE = 4     # bits of phash difference still "the same frame"
+
+def _phash64(img):
+    """64-bit mean hash: 8x8 box downsample to grayscale, one bit per pixel
+    at-or-above the mean. ~0.1 ms, compared with bin(a ^ b).count('1')."""
+    Image = _get_image_module()
+    small = np.asarray(img.resize((8, 8), Image.Resampling.BOX).convert('L'), dtype=np.float32)
+    bits = (small >= small.mean()).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+def _guidance_cache_get(sid, phash, step_key):
+    """Return cached guidance for a near-duplicate recent frame, else None."""
+    if phash is None:
+        return None
+    entries = _VISION_GUIDANCE_CACHE.get(sid)
+    if not entries:
+        return None
+    now = time.monotonic()
+    for cached_hash, cached_step, expires_at, guidance in entries:
+        if cached_step != step_key or expires_at < now:
+            continue
+        if bin(cached_hash ^ phash).count('1') <= _VISION_HAMMING_TOLERANCE:
+            return guidance
+    return None
+
+def _guidance_cache_put(sid, phash, step_key, guidance):
+    if phash is None:
+        return
+    entries = _VISION_GUIDANCE_CACHE.get(sid)
+    if entries is None:
+        entries = deque(maxlen=_VISION_GUIDANCE_PER_SESSION)
+        _VISION_GUIDANCE_CACHE[sid] = entries
+    entries.append((phash, step_key, time.monotonic() + _VISION_GUIDANCE_TTL, guidance))
 
 @app.route('/api/vision/toggle', methods=['POST'])
 def vision_toggle():
@@ -751,9 +1093,24 @@ def vision_status():
     st = VISION_STATE.get(sid) if sid else None
     return jsonify({'success': True, 'enabled': bool(st and st.get('enabled')), 'last': (st or {}).get('last')})
 
+def _fast_downscale(img, target, final_resample):
+    """Two-pass downscale: integer box reduce to within 2x of target, then a
+    short resampler pass. The box pass is a cheap averaging filter, so the
+    expensive convolution only runs over a near-target-sized image. Matters
+    most for PNG/WebP uploads where JPEG draft couldn't pre-shrink."""
+    factor = min(img.size[0] // target[0], img.size[1] // target[1])
+    if factor >= 2:
+        img = img.reduce(factor)
+    img.thumbnail(target, final_resample)
+    return img
+
 @app.route('/api/vision/frame', methods=['POST'])
 def vision_frame():
     try:
+        # Reject oversized uploads from the declared length, before the form
+        # is parsed or the decoder sees a single byte
+        if request.content_length and request.content_length > MAX_UPLOAD_BYTES:
+            return jsonify({'success': False, 'message': 'image too large'}), 413
         sid, ctrl = _get_controller(create=True)
         if not sid or not ctrl:
             return jsonify({'success': False, 'message': 'session not ready'}), 400
@@ -764,54 +1121,93 @@ def vision_frame():
         ctx = request.form.get('context')
         if not file:
             return jsonify({'success': False, 'message': 'no image'}), 400
+        Image = _get_image_module()
         if Image is None:
             return jsonify({'success': False, 'message': 'Pillow not installed'}), 500
         
         # Optimize image loading - resize large images IMMEDIATELY to prevent memory issues
         try:
-            img = Image.open(file.stream).convert('RGB')
-            # Aggressively resize for faster API calls (max 800x600 - enough for obstacle detection)
-            max_size = (800, 600)
-            if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
-                img.thumbnail(max_size, Image.Resampling.LANCZOS)
-                logger.info(f"🖼️ Resized image from original to {img.size} for faster processing")
-                logger.info(f"Resized image from {file.stream} to {img.size}")
+            raw = file.read()
+            img = Image.open(io.BytesIO(raw))
+            img_bytes = None
+            if img.format == 'JPEG' and len(raw) < 200_000 and img.size[0] <= 800 and img.size[1] <= 600:
+                # Upload is already a small JPEG within the target frame:
+                # forward the original bytes to the vision API unchanged and
+                # skip the decode -> resize -> re-encode round trip entirely
+                img_bytes = raw
+            else:
+                # For JPEG uploads, ask libjpeg to decode at a reduced scale
+                # (1/2, 1/4 or 1/8 DCT shrink-on-load) instead of decoding the
+                # full phone-camera frame and resampling it down afterwards
+                drafted = img.draft('RGB', (800, 600))
+                img = img.convert('RGB')
+                # Aggressively resize for faster API calls (max 800x600 - enough for obstacle detection)
+                max_size = (800, 600)
+                if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
+                    # After the DCT pre-shrink, BICUBIC is cheaper than LANCZOS at
+                    # equivalent quality; keep LANCZOS for sources draft can't help
+                    resample = Image.Resampling.BICUBIC if drafted else Image.Resampling.LANCZOS
+                    img = _fast_downscale(img, max_size, resample)
+                    logger.info(f"🖼️ Resized image from original to {img.size} for faster processing")
+                    logger.info(f"Resized image from {file.stream} to {img.size}")
         except Exception as e:
             logger.error(f"Failed to load image: {e}")
             return jsonify({'success': False, 'message': f'Invalid image: {str(e)}'}), 400
-        
+
         nav = ctrl.navigation_service.get_current_instruction()
-        
-        # Use timeout for vision processing to prevent worker hangs
+        step_key = ''
         try:
-            guidance = analyze_image_with_context(img, nav, ctx)
-        except Exception as e:
-            logger.error(f"Vision analysis failed: {e}")
-            # Strict: do not fabricate guidance
-            return jsonify({'success': False, 'message': 'vision unavailable'}), 503
-        
+            if isinstance(nav, dict):
+                step_key = str(nav.get('id') or nav.get('index') or nav.get('instruction') or nav.get('speech_instruction') or '')
+        except Exception:
+            step_key = ''
+
+        # Near-duplicate frame for the same step: reuse the cached Grok result
+        try:
+            phash = _phash64(img)
+        except Exception:
+            phash = None
+
+        # Fast return: if the frame is essentially identical to the previous
+        # one for the same step, re-serve the previous fused response without
+        # touching analysis or fusion at all. In stationary/slow-walking
+        # footage the majority of frames take this exit.
+        last_phash = st.get('last_phash')
+        last_fused = st.get('last_fused')
+        if (phash is not None and last_phash is not None and last_fused is not None
+                and step_key == st.get('last_step_key')
+                and bin(phash ^ last_phash).count('1') <= 5
+                and time.monotonic() - st.get('last_fused_mono', 0.0) < _VISION_GUIDANCE_TTL):
+            repeat = dict(last_fused)
+            repeat['spoken'] = False  # nothing new to say for an unchanged scene
+            return jsonify(repeat)
+
+        guidance = _guidance_cache_get(sid, phash, step_key)
+        if guidance is None:
+            # Use timeout for vision processing to prevent worker hangs
+            try:
+                guidance = analyze_image_with_context(img, nav, ctx, img_bytes=img_bytes)
+            except Exception as e:
+                logger.error(f"Vision analysis failed: {e}")
+                # Strict: do not fabricate guidance
+                return jsonify({'success': False, 'message': 'vision unavailable'}), 503
+            _guidance_cache_put(sid, phash, step_key, guidance)
+
         fused = fuse_nav_and_vision(nav, guidance)
         narration = (fused.get('narration') or '').strip()
 
         # Decide whether to speak (throttle and only on changes)
         hazards = fused.get('hazards') or []
         steer = fused.get('suggested_heading') or 'straight'
-        step_key = ''
-        try:
-            if isinstance(nav, dict):
-                step_key = str(nav.get('id') or nav.get('index') or nav.get('instruction') or nav.get('speech_instruction') or '')
-        except Exception:
-            step_key = ''
         hazard_key = '|'.join(sorted([str(h) for h in hazards])) + f':{steer}'
         generic = narration.lower() in ('proceed carefully.', 'proceed straight carefully.', 'proceed carefully')
 
-        now = datetime.now()
+        # Monotonic floats for the throttle: no isoformat round-trips on every
+        # frame and immune to wall-clock jumps
+        now = time.monotonic()
         last_spoken = (st or {}).get('last_spoken') or {}
-        last_ts = last_spoken.get('ts')
-        try:
-            elapsed = (now - datetime.fromisoformat(last_ts)).total_seconds() if last_ts else None
-        except Exception:
-            elapsed = None
+        last_ts = last_spoken.get('ts_mono')
+        elapsed = None if last_ts is None else now - last_ts
 
         should_speak = False
         # Prioritize vision guidance - speak more frequently for obstacles
@@ -826,31 +1222,71 @@ def vision_frame():
             should_speak = False
         # Enforce minimum gap (shorter for obstacles, longer for route changes)
         min_gap = 1 if hazards else 3  # Reduced gaps for more responsive guidance
-        if should_speak and (elapsed is None or elapsed >= min_gap) and narration:
+        spoken = bool(should_speak and (elapsed is None or elapsed >= min_gap) and narration)
+        if spoken:
             ctrl.speech_service.speak(narration, priority='high')
             st['last_spoken'] = {
                 'narration': narration,
                 'hazard_key': hazard_key,
                 'step_key': step_key,
                 'steer': steer,
-                'ts': now.isoformat(),
+                'ts_mono': now,
             }
 
-        st['last'] = {'narration': narration, 'hazards': fused.get('hazards'), 'ts': now.isoformat(), 'provider': guidance.get('provider')}
-        return jsonify({'success': True, **fused, 'provider': guidance.get('provider'), 'spoken': bool(should_speak and (elapsed is None or elapsed >= min_gap) and narration)})
+        # Human-readable timestamp only where it is surfaced to the client
+        st['last'] = {'narration': narration, 'hazards': fused.get('hazards'), 'ts': datetime.now().isoformat(), 'provider': guidance.get('provider')}
+        # Fill the response fields into fused directly instead of building a
+        # second merged dict; the throttle verdict is reused, not re-derived
+        fused['success'] = True
+        fused['provider'] = guidance.get('provider')
+        fused['spoken'] = spoken
+        # Remember this frame for the unchanged-scene fast return above
+        st['last_phash'] = phash
+        st['last_step_key'] = step_key
+        st['last_fused'] = fused
+        st['last_fused_mono'] = now
+        return jsonify(fused)
     except Exception as e:
         logger.error(f"Vision frame error: {str(e)}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # ================= Vision helpers (Grok + fusion) =================
-from datetime import datetime
 
-def analyze_image_with_context(img, nav, ctx_json):
-    provider = os.getenv('VISION_PROVIDER', 'grok').lower()
-    heuristic_enabled = (os.getenv('VISION_HEURISTIC_ENABLED', 'false').lower() == 'true')
+# Vision configuration is read once at import (after load_dotenv above) rather
+# than via os.getenv on every frame; change it by restarting the worker
+GROK_API_KEY = os.getenv('GROK_API_KEY')
+GROK_API_BASE = os.getenv('GROK_API_BASE', 'https://api.x.ai/v1/chat/completions')
+GROK_MODEL = os.getenv('GROK_VISION_MODEL', 'grok-2-vision')
+GROK_TEXT_KEY = GROK_API_KEY or os.getenv('XAI_API_KEY')
+GROK_TEXT_MODEL = os.getenv('GROK_TEXT_MODEL', 'grok-2-latest')
+try:
+    VISION_TIMEOUT = float(os.getenv('VISION_TIMEOUT_SECONDS', '5'))
+except Exception:
+    VISION_TIMEOUT = 5.0
+VISION_PROVIDER = os.getenv('VISION_PROVIDER', 'grok').lower()
+VISION_HEURISTIC_ENABLED = os.getenv('VISION_HEURISTIC_ENABLED', 'false').lower() == 'true'
+
+# Persistent keep-alive session for Grok calls. Bare requests.post built a
+# new connection per frame - DNS, TCP and TLS handshakes worth hundreds of
+# milliseconds on a path that already waits on the model. Uncached session
+# (unlike HTTP above): these are per-frame POSTs, never cacheable.
+_GROK_SESSION = requests.Session()
+_GROK_SESSION.headers.update({'Content-Type': 'application/json'})
+_grok_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+_GROK_SESSION.mount('https://', _grok_adapter)
+_GROK_SESSION.mount('http://', _grok_adapter)
+
+# Bounded pool for text-LLM calls: caps concurrent upstream requests at 32
+# regardless of how many sessions poll at once, and lets the request path
+# enforce its own deadline via future.result(timeout=...)
+_LLM_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix='llm')
+
+def analyze_image_with_context(img, nav, ctx_json, img_bytes=None):
+    provider = VISION_PROVIDER
+    heuristic_enabled = VISION_HEURISTIC_ENABLED
     if provider in ('grok', 'xai', 'grok-2-vision'):
         try:
-            res = grok_vision(img, nav, ctx_json)
+            res = grok_vision(img, nav, ctx_json, img_bytes=img_bytes)
             if isinstance(res, dict):
                 res.setdefault('provider', 'grok')
             return res
@@ -868,15 +1304,75 @@ def analyze_image_with_context(img, nav, ctx_json):
     raise RuntimeError('Vision analysis unavailable')
 
 
-def grok_vision(img, nav, ctx_json):
-    api_key = os.getenv('GROK_API_KEY')
+def _extract_json_object(content):
+    """Parse the model reply as JSON, returning a dict or None.
+
+    Tries the whole string first (the common, well-behaved case), then falls
+    back to a single bounded scan that tracks string/escape state to slice
+    out the first balanced {...} object. Unlike the old find('{')/rfind('}')
+    approach this never walks the string twice and is not fooled by braces
+    inside string values."""
+    try:
+        parsed = orjson.loads(content)
+        return parsed if isinstance(parsed, dict) else None
+    except orjson.JSONDecodeError:
+        pass
+    start = content.find('{')
+    while start != -1:
+        depth = 0
+        in_str = False
+        esc = False
+        end = -1
+        for i in range(start, len(content)):
+            ch = content[i]
+            if esc:
+                esc = False
+            elif in_str:
+                if ch == '\\':
+                    esc = True
+                elif ch == '"':
+                    in_str = False
+            elif ch == '"':
+                in_str = True
+            elif ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+                if depth == 0:
+                    end = i
+                    break
+        if end != -1:
+            try:
+                parsed = orjson.loads(content[start:end + 1])
+                if isinstance(parsed, dict):
+                    return parsed
+            except orjson.JSONDecodeError:
+                pass
+        start = content.find('{', start + 1)
+    return None
+
+
+def grok_vision(img, nav, ctx_json, img_bytes=None):
+    api_key = GROK_API_KEY
     if not api_key:
         raise RuntimeError('GROK_API_KEY not set')
-    # Encode image with aggressive compression for faster upload
-    buf = io.BytesIO()
-    img.save(buf, format='JPEG', quality=45, optimize=True)  # Aggressive compression for speed
-    img_b64 = base64.b64encode(buf.getvalue()).decode()
-    logger.info(f"📸 Encoded image size: {len(img_b64)} chars (JPEG quality=50)")
+    if img_bytes is None:
+        # Encode image with aggressive compression for faster upload.
+        # Single baseline scan, tuned for a transient buffer on a sub-second
+        # obstacle-detection budget: optimize=False skips the second Huffman
+        # pass (~1.5x encode CPU for a few percent of size), progressive=False
+        # avoids multi-scan encoding the API gains nothing from, 4:2:0 chroma
+        # subsampling and the web_low quantization tables shave another
+        # 10-15% of payload with no meaningful loss for AI vision.
+        buf = io.BytesIO()
+        img.save(buf, format='JPEG', quality=45, optimize=False,
+                 progressive=False, subsampling=2, qtables='web_low')
+        img_bytes = buf.getbuffer()  # memoryview - no copy of the encoded bytes
+    # b64encode reads the buffer directly and the single ascii decode builds
+    # the data URL, instead of getvalue() + b64encode + decode + f-string
+    # each walking its own copy
+    img_url = 'data:image/jpeg;base64,' + base64.b64encode(img_bytes).decode('ascii')
+    logger.info(f"📸 Encoded image size: {len(img_url)} chars (JPEG quality=45)")
     # Compose prompt
     nav_text = ''
     try:
@@ -915,9 +1411,9 @@ def grok_vision(img, nav, ctx_json):
         f"Current route instruction: {nav_text}\nContext: {ctx_json or ''}"
     )
     # xAI Grok API (OpenAI-compatible style)
-    url = os.getenv('GROK_API_BASE', 'https://api.x.ai/v1/chat/completions')
-    model = os.getenv('GROK_VISION_MODEL', 'grok-2-vision')
-    headers = {'Authorization': f'Bearer {api_key}', 'Content-Type': 'application/json'}
+    url = GROK_API_BASE
+    model = GROK_MODEL
+    headers = {'Authorization': f'Bearer {api_key}'}  # Content-Type set on the session
     body = {
         'model': model,
         'messages': [
@@ -925,29 +1421,27 @@ def grok_vision(img, nav, ctx_json):
                 'role': 'user',
                 'content': [
                     {'type': 'text', 'text': prompt},
-                    {'type': 'image_url', 'image_url': {'url': f'data:image/jpeg;base64,{img_b64}'}}
+                    {'type': 'image_url', 'image_url': {'url': img_url}}
                 ]
             }
         ],
         'temperature': 0.2
     }
-    # Fast fail for real-time guidance; configurable via VISION_TIMEOUT_SECONDS
-    try:
-        vision_timeout = float(os.getenv('VISION_TIMEOUT_SECONDS', '5'))
-    except Exception:
-        vision_timeout = 5.0
-    resp = requests.post(url, headers=headers, data=json.dumps(body), timeout=vision_timeout)
+    # Fast fail for real-time guidance; configurable via VISION_TIMEOUT_SECONDS.
+    # This call blocks for the full model round trip, but under the gevent
+    # worker class the patched socket yields the hub, so one worker keeps
+    # serving other sessions' requests while this greenlet waits on Grok.
+    # orjson: the body is dominated by the base64 image and serializes to
+    # bytes directly, so nothing re-encodes the payload before the socket
+    resp = _GROK_SESSION.post(url, headers=headers, data=orjson.dumps(body), timeout=VISION_TIMEOUT)
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content)
     # Extract assistant content
     try:
         content = data['choices'][0]['message']['content']
         # Some providers return text not structured; try to parse JSON from it
-        jstart = content.find('{')
-        jend = content.rfind('}')
-        if jstart >= 0 and jend > jstart:
-            parsed = json.loads(content[jstart:jend+1])
-        else:
+        parsed = _extract_json_object(content)
+        if parsed is None:
             parsed = {'narration': content.strip()[:120]}
         # Normalize
         parsed.setdefault('hazards', [])
@@ -958,24 +1452,24 @@ def grok_vision(img, nav, ctx_json):
     except Exception as e:
         logger.error(f"Grok parse error: {e}; raw={data}")
         # Respect strict mode: do not fabricate narration
-        if os.getenv('VISION_HEURISTIC_ENABLED', 'false').lower() == 'true':
+        if VISION_HEURISTIC_ENABLED:
             return {'hazards': [], 'suggested_heading': 'straight', 'narration': 'Proceed carefully.', 'provider': 'grok'}
         raise RuntimeError('Vision parse failed')
 
 
 def heuristic_vision(img, nav, ctx_json):
     try:
-        from PIL import ImageStat
+        # Single vectorized pass instead of three PIL crop+ImageStat walks.
+        # The 4x box reduce first is safe - a strip brightness mean barely
+        # changes under downsampling - and cuts the work 16x.
         g = img.convert('L')  # grayscale
-        w, h = g.size
-        third = max(1, w // 3)
-        boxes = [
-            (0, 0, third, h),
-            (third, 0, 2*third, h),
-            (2*third, 0, w, h)
-        ]
-        means = [ImageStat.Stat(g.crop(b)).mean[0] for b in boxes]
-        left, center, right = means
+        if min(g.size) >= 8:
+            g = g.reduce(4)
+        arr = np.asarray(g, dtype=np.uint8)
+        third = max(1, arr.shape[1] // 3)
+        left = float(arr[:, :third].mean())
+        center = float(arr[:, third:2 * third].mean())
+        right = float(arr[:, 2 * third:].mean())
         hazards = []
         steer = 'straight'
         if center + 12 < max(left, right):
@@ -1002,6 +1496,22 @@ def heuristic_vision(img, nav, ctx_json):
         return {'hazards': [], 'suggested_heading': 'straight', 'narration': 'Proceed carefully.', 'provider': 'heuristic'}
 
 
+# Steering -> narration templates for fuse_nav_and_vision: a dict lookup
+# replaces the per-frame if/elif ladders. Frozen like the other constant
+# tables in this module.
+_STEER_TEMPLATES = types.MappingProxyType({
+    'left': '{p}move left, then continue {d}',
+    'right': '{p}move right, then continue {d}',
+    'slightly left': '{p}move slightly left, then continue {d}',
+    'slightly right': '{p}move slightly right, then continue {d}',
+})
+# Obstacle detected but no steering suggested: dodge away from the upcoming
+# turn direction (default slight left on straight routes)
+_NO_STEER_TEMPLATES = types.MappingProxyType({
+    'left': '{p}move right, then continue {d}',
+    'right': '{p}move left, then continue {d}',
+})
+
 def fuse_nav_and_vision(nav, vis):
     hazards = [str(h).strip() for h in (vis.get('hazards') or []) if str(h).strip()]
     steer = (vis.get('suggested_heading') or '').strip().lower() or 'straight'
@@ -1022,11 +1532,11 @@ def fuse_nav_and_vision(nav, vis):
         pass
 
     # Convert distance to steps (approximate: 1 step = 0.7 meters)
-    steps_remaining = int(nav_distance / 0.7) if nav_distance > 0 else 0
+    steps_remaining = int(nav_distance * 10) // 7 if nav_distance > 0 else 0
 
     # Combine map instruction with vision analysis
     # Only prioritize vision if obstacles are actually detected
-    if hazards and len(hazards) > 0:
+    if hazards:
         # Obstacles detected - include names and provide actionable avoidance guidance
         try:
             obstacle_names = ', '.join([humanize_hazard(h) for h in hazards])
@@ -1035,25 +1545,12 @@ def fuse_nav_and_vision(nav, vis):
             obstacle_prefix = "Obstacle ahead, "
         if steer != 'straight':
             # Give clear direction to avoid obstacle and continue route
-            if steer == 'left':
-                narration = f"{obstacle_prefix}move left, then continue {nav_direction}"
-            elif steer == 'right':
-                narration = f"{obstacle_prefix}move right, then continue {nav_direction}"
-            elif steer == 'slightly left':
-                narration = f"{obstacle_prefix}move slightly left, then continue {nav_direction}"
-            elif steer == 'slightly right':
-                narration = f"{obstacle_prefix}move slightly right, then continue {nav_direction}"
-            else:
-                narration = f"{obstacle_prefix}move {steer}, then continue {nav_direction}"
+            template = _STEER_TEMPLATES.get(steer, '{p}move {s}, then continue {d}')
         else:
-            # Obstacle detected but no clear steering - provide default avoidance guidance
-            if nav_direction == 'left':
-                narration = f"{obstacle_prefix}move right, then continue {nav_direction}"
-            elif nav_direction == 'right':
-                narration = f"{obstacle_prefix}move left, then continue {nav_direction}"
-            else:
-                # Default to slight left for straight routes
-                narration = f"{obstacle_prefix}move slightly left, then continue {nav_direction}"
+            # Obstacle detected but no clear steering - provide default
+            # avoidance guidance (slight left on straight routes)
+            template = _NO_STEER_TEMPLATES.get(nav_direction, '{p}move slightly left, then continue {d}')
+        narration = template.format(p=obstacle_prefix, d=nav_direction, s=steer)
     else:
         # No obstacles - provide step-by-step guidance based on map instruction
         if steps_remaining > 0:
@@ -1076,11 +1573,9 @@ def fuse_nav_and_vision(nav, vis):
             else:
                 narration = 'Continue straight ahead.'
 
-    # Improve narration for blind users
-    narration = improve_narration_for_blind_users(narration)
-    
-    # Add intersection guidance
-    narration = add_intersection_guidance(narration, nav)
+    # Improve narration for blind users and add intersection guidance
+    # (single memoized pass)
+    narration = _improve_instruction_text(narration)
 
     return {
         'narration': narration, 
@@ -1126,96 +1621,157 @@ def get_steering_guidance(steer: str) -> str:
         return 'Move right'
     return 'Continue straight'
 
+# Distance-stripping patterns for make_route_instruction_brief, compiled once
+# at import so the per-call work is just the substitution passes
+_RE_IN_METERS = re.compile(r'\bin\s+\d+\s*(meters?|m|feet?|ft)[,\s]*', re.IGNORECASE)
+_RE_DIST = re.compile(r'\d+\s*(meters?|m|feet?|ft)', re.IGNORECASE)
+_RE_LEADING_IN = re.compile(r'^in[,\s]+', re.IGNORECASE)
+_RE_COMMA_SPACING = re.compile(r'\s*,\s*')
+_RE_DOUBLE_COMMA = re.compile(r',\s*,')
+_RE_MULTISPACE = re.compile(r'\s+')
+
+# Arabic street-name handling for TTS-bound instructions, compiled once at
+# import instead of per call inside the unified-instruction handler
+_ARABIC_RE = re.compile(r'[\u0600-\u06FF]+')
+_ARABIC_ON_RE = re.compile(r'\s+(on|onto)\s+[\u0600-\u06FF\s]+')
+# A whole run of Arabic words (with any separating whitespace) in one match,
+# so substitute -> dedupe -> replace collapses to a single pass
+_ARABIC_RUN_RE = re.compile(r'[\u0600-\u06FF]+(?:\s+[\u0600-\u06FF]+)*')
+_HAS_DISTANCE_RE = re.compile(r'\b(\d+)\s*(meters?|m|steps?)\b', re.IGNORECASE)
+
+def contains_arabic(s: str) -> bool:
+    # isascii() is an O(1) flag check for compact-ASCII strings (the common
+    # case: English street names), so most calls never start the regex engine
+    if not s or s.isascii():
+        return False
+    return _ARABIC_RE.search(s) is not None
+
+@lru_cache(maxsize=256)
+def translate_arabic_names(text: str) -> str:
+    """Simplify instructions by removing Arabic street names.
+    This makes TTS clearer for English speakers.
+    """
+    if not text or text.isascii() or not contains_arabic(text):
+        return text
+
+    # Remove "on [Arabic text]" or "onto [Arabic text]" patterns entirely
+    # This makes instructions simpler: "Start on شارع" → "Start ahead"
+    text_cleaned = _ARABIC_ON_RE.sub('', text)
+
+    # If we removed content, clean up the result
+    if text_cleaned != text:
+        text_cleaned = _RE_MULTISPACE.sub(' ', text_cleaned).strip()
+        # Add simple direction if instruction is now too vague
+        if text_cleaned.lower() in ['start', 'continue', 'turn']:
+            text_cleaned += ' ahead'
+        return text_cleaned
+
+    # Fallback: replace each run of Arabic words with a generic name in one
+    # scan (the old chain did placeholder substitution, placeholder dedupe and
+    # str.replace as three separate passes, each allocating a new string)
+    result = _ARABIC_RUN_RE.sub('the road', text)
+    result = _RE_MULTISPACE.sub(' ', result).strip()
+
+    return result
+
 def make_route_instruction_brief(instruction: str) -> str:
     """Make route instructions more concise for real-time navigation"""
-    # Remove distance details for smoother navigation
-    import re
-    
     # Remove "In X meters" patterns
-    brief = re.sub(r'\bin\s+\d+\s*(meters?|m|feet?|ft)[,\s]*', '', instruction, flags=re.IGNORECASE)
+    brief = _RE_IN_METERS.sub('', instruction)
     # Remove standalone distance mentions
-    brief = re.sub(r'\d+\s*(meters?|m|feet?|ft)', '', brief, flags=re.IGNORECASE)
-    
+    brief = _RE_DIST.sub('', brief)
+
     # Remove leftover "In," or "in," at start
-    brief = re.sub(r'^in[,\s]+', '', brief, flags=re.IGNORECASE)
-    
+    brief = _RE_LEADING_IN.sub('', brief)
+
     # Clean up multiple spaces and commas
-    brief = re.sub(r'\s*,\s*', ', ', brief)  # Fix comma spacing
-    brief = re.sub(r',\s*,', ',', brief)  # Remove double commas
-    brief = re.sub(r'\s+', ' ', brief).strip()
+    brief = _RE_COMMA_SPACING.sub(', ', brief)  # Fix comma spacing
+    brief = _RE_DOUBLE_COMMA.sub(',', brief)  # Remove double commas
+    brief = _RE_MULTISPACE.sub(' ', brief).strip()
     brief = brief.strip(',').strip()  # Remove leading/trailing commas
-    
+
     # Make it more actionable
-    if 'turn right' in brief.lower():
+    low = brief.lower()
+    if 'turn right' in low:
         return 'Turn right when you reach the intersection'
-    elif 'turn left' in brief.lower():
+    elif 'turn left' in low:
         return 'Turn left when you reach the intersection'
-    elif 'straight' in brief.lower():
+    elif 'straight' in low:
         return 'Continue straight ahead'
-    elif 'start' in brief.lower() and 'on' in brief.lower():
+    elif 'start' in low and 'on' in low:
         # Keep start instructions simple
         return brief
     else:
         return brief
 
+# Common confusing phrases and their better alternatives for blind users.
+# The literal phrases are fused into ONE alternation regex applied in a single
+# scan with a dict lookup per match - running them as ~25 separate re.sub
+# passes meant ~25 full walks over every narration on the vision hot path.
+# Alternation order follows insertion order, so longer phrases stay listed
+# before their prefixes ('watch for obstacles' before 'watch for').
+_IMPROVEMENT_LITERALS = {
+    # Start/Depart instructions
+    'start and go straight': 'begin walking straight ahead',
+    'start': 'begin walking',
+    'depart': 'begin walking',
+    'go straight': 'walk straight ahead',
+    'continue straight': 'keep walking straight ahead',
+
+    # Turn instructions - make them actionable with distance guidance
+    'turn right at the next intersection': 'walk straight until you feel the intersection, then turn right',
+    'turn left at the next intersection': 'walk straight until you feel the intersection, then turn left',
+    'turn slightly right at the next intersection': 'walk straight until you feel the intersection, then turn slightly right',
+    'turn slightly left at the next intersection': 'walk straight until you feel the intersection, then turn slightly left',
+
+    # Arrival instructions
+    'you have arrived at your destination': 'you have reached your destination',
+    'you have arrived': 'you have reached your destination',
+    'arrive at your destination': 'you have reached your destination',
+
+    # Road/Street names
+    'on the road': 'on the street',
+    'onto the road': 'onto the street',
+
+    # Safety instructions - remove "watch for obstacles" since they can't see
+    'proceed carefully': 'walk slowly and listen for guidance',
+    'proceed straight carefully': 'walk straight ahead slowly and listen for guidance',
+    'walk carefully and watch for obstacles': 'walk slowly and listen for guidance',
+    'watch for obstacles': 'listen for guidance about obstacles',
+    'watch for': 'listen for guidance about',
+}
+_IMPROVEMENT_LITERAL_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(k) for k in _IMPROVEMENT_LITERALS) + r')\b')
+
+# The few true regex patterns (backreferences, wildcards) stay as separate
+# compiled substitutions
+_IMPROVEMENT_REGEXES = [(re.compile(p), r) for p, r in {
+    # Distance and timing - make them more specific
+    r'\bin (\d+) meters\b': r'walk approximately \1 meters',
+    r'\bin about (\d+) meters\b': r'walk approximately \1 meters',
+    r'\bin (\d+) min\b': r'walk for about \1 minutes',
+
+    # Remove contradictory instructions
+    r'\bguide around.*?\.\s*keep walking straight ahead after avoiding\b': 'Move left to avoid obstacle',
+    r'\bguide around.*?\.\s*continue straight after avoiding\b': 'Move left to avoid obstacle',
+    r'\bguide around.*?\.\s*then continue straight\b': 'Move left to avoid obstacle',
+}.items()]
+
+@lru_cache(maxsize=1024)
 def improve_narration_for_blind_users(narration):
     """Improve navigation narration to be more clear and actionable for blind users."""
     if not narration:
         return narration
-    
-    # Common confusing phrases and their better alternatives for blind users
-    improvements = {
-        # Start/Depart instructions
-        r'\bstart and go straight\b': 'begin walking straight ahead',
-        r'\bstart\b': 'begin walking',
-        r'\bdepart\b': 'begin walking',
-        r'\bgo straight\b': 'walk straight ahead',
-        r'\bcontinue straight\b': 'keep walking straight ahead',
-        
-        # Turn instructions - make them actionable with distance guidance
-        r'\bturn right at the next intersection\b': 'walk straight until you feel the intersection, then turn right',
-        r'\bturn left at the next intersection\b': 'walk straight until you feel the intersection, then turn left',
-        r'\bturn slightly right at the next intersection\b': 'walk straight until you feel the intersection, then turn slightly right',
-        r'\bturn slightly left at the next intersection\b': 'walk straight until you feel the intersection, then turn slightly left',
-        r'\bturn right\b': 'turn right',
-        r'\bturn left\b': 'turn left',
-        r'\bturn slightly right\b': 'turn slightly right',
-        r'\bturn slightly left\b': 'turn slightly left',
-        
-        # Distance and timing - make them more specific
-        r'\bin (\d+) meters\b': r'walk approximately \1 meters',
-        r'\bin about (\d+) meters\b': r'walk approximately \1 meters',
-        r'\bin (\d+) min\b': r'walk for about \1 minutes',
-        
-        # Arrival instructions
-        r'\byou have arrived at your destination\b': 'you have reached your destination',
-        r'\byou have arrived\b': 'you have reached your destination',
-        r'\barrive at your destination\b': 'you have reached your destination',
-        
-        # Road/Street names
-        r'\bon the road\b': 'on the street',
-        r'\bonto the road\b': 'onto the street',
-        
-        # Safety instructions - remove "watch for obstacles" since they can't see
-        r'\bproceed carefully\b': 'walk slowly and listen for guidance',
-        r'\bproceed straight carefully\b': 'walk straight ahead slowly and listen for guidance',
-        r'\bwalk carefully and watch for obstacles\b': 'walk slowly and listen for guidance',
-        r'\bwatch for obstacles\b': 'listen for guidance about obstacles',
-        r'\bwatch for\b': 'listen for guidance about',
-        
-        # Remove contradictory instructions
-        r'\bguide around.*?\.\s*keep walking straight ahead after avoiding\b': 'Move left to avoid obstacle',
-        r'\bguide around.*?\.\s*continue straight after avoiding\b': 'Move left to avoid obstacle',
-        r'\bguide around.*?\.\s*then continue straight\b': 'Move left to avoid obstacle',
-    }
-    
-    import re
+
+    # Input is lowercased first, so the patterns match without IGNORECASE
     improved = narration.lower()
-    
-    # Apply improvements
-    for pattern, replacement in improvements.items():
-        improved = re.sub(pattern, replacement, improved, flags=re.IGNORECASE)
-    
+
+    # Apply improvements: one pass for all literal phrases, then the regexes
+    improved = _IMPROVEMENT_LITERAL_RE.sub(
+        lambda m: _IMPROVEMENT_LITERALS[m.group(0)], improved)
+    for pattern, replacement in _IMPROVEMENT_REGEXES:
+        improved = pattern.sub(replacement, improved)
+
     # Capitalize first letter
     if improved:
         improved = improved[0].upper() + improved[1:]
@@ -1226,28 +1782,41 @@ def improve_narration_for_blind_users(narration):
     
     return improved
 
-def add_intersection_guidance(narration, nav_instruction=None):
+@lru_cache(maxsize=1024)
+def add_intersection_guidance(narration):
     """Add specific guidance for intersections and turns."""
     if not narration:
         return narration
     
     # Check if this is a turn instruction
+    low = narration.lower()
     turn_phrases = ['turn right', 'turn left', 'turn slightly right', 'turn slightly left']
-    is_turn = any(phrase in narration.lower() for phrase in turn_phrases)
-    
-    if is_turn and 'intersection' in narration.lower():
+    is_turn = any(phrase in low for phrase in turn_phrases)
+
+    if is_turn and 'intersection' in low:
         # Add step-by-step guidance for turns
-        if 'turn right' in narration.lower():
+        if 'turn right' in low:
             return narration.replace('turn right', 'turn right and walk 10 steps forward')
-        elif 'turn left' in narration.lower():
+        elif 'turn left' in low:
             return narration.replace('turn left', 'turn left and walk 10 steps forward')
-        elif 'turn slightly right' in narration.lower():
+        elif 'turn slightly right' in low:
             return narration.replace('turn slightly right', 'turn slightly right and walk 10 steps forward')
-        elif 'turn slightly left' in narration.lower():
+        elif 'turn slightly left' in low:
             return narration.replace('turn slightly left', 'turn slightly left and walk 10 steps forward')
-    
+
     return narration
 
+@lru_cache(maxsize=1024)
+def _improve_instruction_text(text: str) -> str:
+    """
+    Fused improve_narration_for_blind_users + add_intersection_guidance.
+
+    Navigation instructions repeat unchanged across many polls between step
+    transitions, so memoizing the combined transformation skips the whole
+    regex pipeline on the hot path.
+    """
+    return add_intersection_guidance(improve_narration_for_blind_users(text))
+
 # ================= Narration improvement endpoint =================
 @app.route('/api/improve-narration', methods=['POST'])
 def improve_narration():
@@ -1290,6 +1859,60 @@ def test_narration():
         logger.error(f"Test narration error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# LLM prompt templates for the unified-instruction endpoint, assembled once
+# at import. Everything that only depends on the routing mode (persona,
+# examples, action verbs, style rules) is baked in; the request fills the
+# three dynamic slots. The old per-request assembly re-ran ~25 f-string
+# fragments and built two helper strings that were never referenced.
+_PROMPT_TMPL_WALK = (
+    "You are a navigation assistant for a BLIND pedestrian WALKING. "
+    "Create ONE natural, conversational sentence for audio guidance. "
+    "Mode: FOOT\n"
+    "Route: {route}\n"
+    "Vision: {vision}\n"
+    "{distance_info}\n\n"
+    "CRITICAL RULES:\n"
+    "IF OBSTACLES DETECTED:\n"
+    "  1. START: 'Obstacle detected on your [left/right/ahead]'\n"
+    "  2. THEN: 'move [left/right]'\n"
+    "  3. THEN: 'then walk ahead'\n"
+    "IF NO OBSTACLES:\n"
+    "  1. START with distance: 'Walk [distance] [direction]'\n\n"
+    "FORMATTING:\n"
+    "- Simple, natural English\n"
+    "- NEVER use: watch, see, look\n"
+    "- Maximum 15 words\n"
+    "- Avoid visual verbs (see, look, watch)\n"
+    "- Use pedestrian terms (walk, turn, cross)\n\n"
+    "CORRECT with obstacle: 'Obstacles: chair desk ahead, move slightly left, then walk 120 steps straight.'\n"
+    "CORRECT without obstacle: 'Walk 120 steps straight ahead for 84 meters.'\n\n"
+    "Your sentence:"
+)
+_PROMPT_TMPL_DRIVE = (
+    "You are a navigation assistant for a driver in a VEHICLE. "
+    "Create ONE natural, conversational sentence for audio guidance. "
+    "Mode: {mode}\n"
+    "Route: {route}\n"
+    "Vision: {vision}\n"
+    "{distance_info}\n\n"
+    "CRITICAL RULES:\n"
+    "IF OBSTACLES DETECTED:\n"
+    "  1. START: 'Obstacle detected on your [left/right/ahead]'\n"
+    "  2. THEN: 'move [left/right]'\n"
+    "  3. THEN: 'then drive ahead'\n"
+    "IF NO OBSTACLES:\n"
+    "  1. START with distance: 'Drive [distance] [direction]'\n\n"
+    "FORMATTING:\n"
+    "- Simple, natural English\n"
+    "- NEVER use: watch, see, look\n"
+    "- Maximum 15 words\n"
+    "- Use driving terms (drive, turn, merge, exit)\n"
+    "- NO walking/stepping references\n\n"
+    "CORRECT with obstacle: 'Obstacles detected ahead, move left, then continue driving.'\n"
+    "CORRECT without obstacle: 'Drive 48 meters straight ahead.'\n\n"
+    "Your sentence:"
+)
+
 @app.route('/api/navigation/unified-instruction', methods=['GET'])
 def get_unified_instruction():
     """Get unified smart instruction combining map navigation and vision analysis."""
@@ -1329,331 +1952,243 @@ def get_unified_instruction():
         obstacle_state = 'none'
         if vision_enabled and last_vision:
             hazards = last_vision.get('hazards', [])
-            if hazards and len(hazards) > 0:
+            if hazards:
                 # Include actual obstacle names in cache key so it updates when obstacles change
                 obstacle_state = f"obs_{'_'.join(sorted(hazards[:3]))}"  # Use actual obstacle names
                 logger.info(f"🚧 Obstacles detected: {hazards} → cache_state: {obstacle_state}")
         
         # Check if step index OR obstacle state changed - regenerate if either changed
         current_step_index = ctrl.navigation_service.current_step_index
-        cache_key = f"instruction_{sid}_{current_step_index}_{obstacle_state}"
-        
-        # CRITICAL DEBUG: Log distance to waypoint and step index
-        try:
-            current_location = ctrl.location_service.get_current_location()
-            if current_location and nav_instruction:
-                waypoint_coords = nav_instruction.get('maneuver', {}).get('location') if isinstance(nav_instruction, dict) else None
-                if waypoint_coords:
-                    from math import radians, sin, cos, sqrt, atan2
-                    lat1, lon1 = radians(current_location['lat']), radians(current_location['lng'])
-                    lat2, lon2 = radians(waypoint_coords[1]), radians(waypoint_coords[0])
-                    dlat, dlon = lat2 - lat1, lon2 - lon1
-                    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-                    distance_to_waypoint = 6371000 * 2 * atan2(sqrt(a), sqrt(1-a))
-                    logger.info(f"🎯 [NAVIGATION] Step {current_step_index}: Distance to waypoint: {distance_to_waypoint:.1f}m, Obstacle state: {obstacle_state}")
-        except Exception as e:
-            logger.warning(f"Could not calculate waypoint distance: {e}")
-        
-        # Return cached instruction if step AND obstacle state haven't changed
-        cached = _get_cached_response(cache_key)
-        if cached:
-            logger.info(f"✅ [CACHE HIT] Returning cached instruction for session {sid}, step {current_step_index}, obstacles: {obstacle_state}")
-            return jsonify(cached)
-        
-        logger.info(f"📝 [CACHE MISS] Generating NEW instruction for session {sid}, step {current_step_index}")
-        
-        # Get vision state
-        vision_state = VISION_STATE.get(sid, {})
-        vision_enabled = vision_state.get('enabled', False)
+        # Digest the key instead of concatenating: obstacle_state embeds the
+        # raw hazard names, so the f-string key could grow unbounded and makes
+        # every TTL-cache lookup hash a long string. A 16-byte BLAKE2b digest
+        # keeps keys fixed-size and collision-safe for this keyspace.
+        cache_key = hashlib.blake2b(
+            f"{sid}|{current_step_index}|{obstacle_state}".encode(), digest_size=16
+        ).hexdigest()
+        
+        # CRITICAL DEBUG: Log distance to waypoint and step index.
+        # Skipped entirely when INFO logging is off, and uses the
+        # equirectangular approximation instead of full Haversine: waypoint
+        # distances here are well under 500 m, where the error is <0.5 m,
+        # and it needs one cos + one sqrt instead of four sins and an atan2.
+        if logger.isEnabledFor(logging.INFO):
+            try:
+                current_location = ctrl.location_service.get_current_location()
+                if current_location and nav_instruction:
+                    waypoint_coords = nav_instruction.get('maneuver', {}).get('location') if isinstance(nav_instruction, dict) else None
+                    if waypoint_coords:
+                        from math import radians, cos, sqrt
+                        lat1, lon1 = radians(current_location['lat']), radians(current_location['lng'])
+                        lat2, lon2 = radians(waypoint_coords[1]), radians(waypoint_coords[0])
+                        x = (lon2 - lon1) * cos((lat1 + lat2) / 2)
+                        y = lat2 - lat1
+                        distance_to_waypoint = 6371000 * sqrt(x * x + y * y)
+                        logger.info(f"🎯 [NAVIGATION] Step {current_step_index}: Distance to waypoint: {distance_to_waypoint:.1f}m, Obstacle state: {obstacle_state}")
+            except Exception as e:
+                logger.warning(f"Could not calculate waypoint distance: {e}")
         
-        # Determine context and priority
-        context = "Route following"
-        priority = "map"
+        # Cached + coalesced on (session, step, obstacle-state): the producer
+        # below may call the Grok LLM, so concurrent polls that miss the cache
+        # must share a single computation rather than each paying for a call
+        cache_duration = 1 if vision_enabled else 10  # short with vision for immediate obstacle updates
+
+        def _produce_unified_payload():
+            logger.info(f"📝 [CACHE MISS] Generating NEW instruction for session {sid}, step {current_step_index}")
         
-        # Get distance and time info FIRST
-        distance = nav_instruction.get('distance', 0) if nav_instruction else 0
-        duration = nav_instruction.get('duration', 0) if nav_instruction else 0
-
-        # ---- Helpers for merging/translation ---------------------------------
-        def contains_arabic(s: str) -> bool:
-            return any('\u0600' <= ch <= '\u06FF' for ch in s or '')
-
-        def translate_arabic_names(text: str) -> str:
-            """Simplify instructions by removing Arabic street names.
-            This makes TTS clearer for English speakers.
-            """
-            if not text:
-                return text
-            if not contains_arabic(text):
-                return text
-            
-            import re
-            # Remove "on [Arabic text]" or "onto [Arabic text]" patterns entirely
-            # This makes instructions simpler: "Start on شارع" → "Start ahead"
-            text_cleaned = re.sub(r'\s+(on|onto)\s+[\u0600-\u06FF\s]+', '', text)
-            
-            # If we removed content, clean up the result
-            if text_cleaned != text:
-                text_cleaned = re.sub(r'\s+', ' ', text_cleaned).strip()
-                # Add simple direction if instruction is now too vague
-                if text_cleaned.lower() in ['start', 'continue', 'turn']:
-                    text_cleaned += ' ahead'
-                return text_cleaned
-            
-            # Fallback: replace Arabic with generic placeholder (if removal didn't work)
-            result = re.sub(r'[\u0600-\u06FF]+', '[ARABIC]', text)
-            result = re.sub(r'\[ARABIC\](\s+\[ARABIC\])+', '[ARABIC]', result)
-            result = result.replace('[ARABIC]', 'the road')
-            result = re.sub(r'\s+', ' ', result).strip()
-            
-            return result
+            # Get vision state
+            vision_state = VISION_STATE.get(sid, {})
+            vision_enabled = vision_state.get('enabled', False)
         
-        # ONLY create fallback instruction if vision is OFF or LLM will fail
-        # When vision is ON, LLM will handle EVERYTHING
-        if not vision_enabled:
-            # No vision - create simple route instruction as fallback
-            context = "Route following (no vision)"
+            # Determine context and priority
+            context = "Route following"
             priority = "map"
-            if nav_instruction:
-                nav_text = nav_instruction.get('speech_instruction') or nav_instruction.get('instruction') or ''
-                instruction = translate_arabic_names(make_route_instruction_brief(nav_text))
-            else:
-                instruction = "Continue following your route."
-        else:
-            # Vision is ON - LLM will create the instruction, just set context
+        
+            # Get distance and time info FIRST
+            distance = nav_instruction.get('distance', 0) if nav_instruction else 0
+            duration = nav_instruction.get('duration', 0) if nav_instruction else 0
+
+            # Vision + mode locals shared by the LLM prompt, the trivial-case
+            # bypass and the fallback formatter below; all cheap dict reads
+            routing_mode = ctrl.routing_mode if hasattr(ctrl, 'routing_mode') else 'foot'
+            is_walking = routing_mode == 'foot'
             last_vision = vision_state.get('last', {})
-            hazards = last_vision.get('hazards', [])
-            
-            if hazards and len(hazards) > 0:
-                context = "Live Vision: Obstacle detected"
-                priority = "vision"
-            else:
-                context = "Live Vision: Path clear"
+            hazards = last_vision.get('hazards') or []
+            steer = last_vision.get('suggested_heading') or 'straight'
+            sign_text = (last_vision.get('sign_text') or last_vision.get('narration') or '').strip()
+            meters = int((nav_instruction or {}).get('distance') or distance or 0)
+
+            # Calculate steps ONLY for walking mode (1 step = 0.7 m; integer
+            # form avoids the float divide + truncation round trip)
+            steps_remaining = (meters * 10) // 7 if (meters > 0 and is_walking) else 0
+
+            # ONLY create fallback instruction if vision is OFF or LLM will fail
+            # When vision is ON, LLM will handle EVERYTHING
+            if not vision_enabled:
+                # No vision - create simple route instruction as fallback
+                context = "Route following (no vision)"
                 priority = "map"
+                if nav_instruction:
+                    nav_text = nav_instruction.get('speech_instruction') or nav_instruction.get('instruction') or ''
+                    instruction = translate_arabic_names(make_route_instruction_brief(nav_text))
+                else:
+                    instruction = "Continue following your route."
+            else:
+                # Vision is ON - LLM will create the instruction, just set context
+                if hazards:
+                    context = "Live Vision: Obstacle detected"
+                    priority = "vision"
+                else:
+                    context = "Live Vision: Path clear"
+                    priority = "map"
             
-            # Placeholder - LLM will replace this
-            instruction = "Processing live vision..."
+                # Placeholder - LLM will replace this
+                instruction = "Processing live vision..."
+
+            compact_map = translate_arabic_names(
+                make_route_instruction_brief(
+                    (nav_instruction.get('speech_instruction') if nav_instruction else '')
+                    or (nav_instruction.get('instruction') if nav_instruction else '')
+                    or instruction
+                )
+            )
 
-        # --- Refine with Grok LLM for mode-appropriate instructions (HIGHLY RECOMMENDED) ---------------------
-        grok_key = os.getenv('GROK_API_KEY') or os.getenv('XAI_API_KEY')
+            # --- Refine with Grok LLM for mode-appropriate instructions (HIGHLY RECOMMENDED) ---------------------
+            grok_key = GROK_TEXT_KEY
         
-        # When vision is enabled, ALWAYS use LLM to combine everything into one instruction
-        # When vision is disabled, LLM is optional (can use fallback)
-        use_llm = grok_key and (vision_enabled or True)  # Always try LLM if key exists
-        
-        if not use_llm:
-            logger.warning("⚠️ GROK_API_KEY not configured! Using fallback instructions (not optimal for users)")
-            context = context + ' (NO LLM - fallback only)'
-        else:
-            # Process instruction through LLM for optimal output
-            try:
-                # Get routing mode from controller
-                routing_mode = ctrl.routing_mode if hasattr(ctrl, 'routing_mode') else 'foot'
-                is_walking = routing_mode == 'foot'
-                
-                compact_map = translate_arabic_names(
-                    make_route_instruction_brief(
-                        (nav_instruction.get('speech_instruction') if nav_instruction else '')
-                        or (nav_instruction.get('instruction') if nav_instruction else '')
-                        or instruction
-                    )
-                )
-                last_vision = VISION_STATE.get(sid, {}).get('last', {})
-                hazards = last_vision.get('hazards') or []
-                steer = (last_vision.get('suggested_heading') or 'straight')
-                sign_text = (last_vision.get('sign_text') or last_vision.get('narration') or '').strip()
-                meters = int((nav_instruction or {}).get('distance') or distance or 0)
-                
-                # Calculate steps ONLY for walking mode
-                steps_remaining = int(meters / 0.7) if (meters > 0 and is_walking) else 0
+            # The LLM path is gated only on having a key; the trivial-case
+            # bypass below decides when a call is actually worth making
+            use_llm = bool(grok_key)
 
-                # Build prompt with vision/image analysis if available
-                vision_line = f"Vision analysis: "
-                if hazards and len(hazards) > 0:
-                    vision_line += f"OBSTACLES DETECTED: {', '.join(hazards)}; "
-                else:
-                    vision_line += f"path clear; "
-                
-                vision_line += f"suggested direction: {steer}"
+            # Shared mode-aware fallback for the trivial-case bypass and the
+            # three LLM failure paths below
+            def _fallback_instruction():
+                if vision_enabled and hazards:
+                    action = "drive" if not is_walking else "walk"
+                    return f"STOP! Obstacle detected. Move {steer}, then {action} ahead."
+                if is_walking and steps_remaining > 0:
+                    # Walking mode: combine steps + direction smoothly
+                    action = compact_map.lower() if compact_map else "continue"
+                    return f"Walk {steps_remaining} steps, then {action}."
+                # Driving mode: include distance in instruction
+                if meters > 0:
+                    action = compact_map.lower() if compact_map else "continue straight"
+                    if meters >= 1000:
+                        return f"Drive {meters/1000:.1f} kilometers, then {action}."
+                    return f"Drive {meters} meters, then {action}."
+                return compact_map if compact_map else "Continue straight ahead."
+        
+            if not use_llm:
+                logger.warning("⚠️ GROK_API_KEY not configured! Using fallback instructions (not optimal for users)")
+                context = context + ' (NO LLM - fallback only)'
+            elif not vision_enabled and not hazards and meters > 0 and compact_map:
+                # No camera frame and no obstacles: there is nothing for the
+                # LLM to fuse that the local formatter does not already say,
+                # so skip the network round trip entirely
+                instruction = _fallback_instruction()
+                context = context + ' (local)'
+            else:
+                # Process instruction through LLM for optimal output
+                try:
+                    # Build prompt with vision/image analysis if available
+                    vision_line = f"Vision analysis: "
+                    if hazards:
+                        vision_line += f"OBSTACLES DETECTED: {', '.join(hazards)}; "
+                    else:
+                        vision_line += f"path clear; "
                 
-                if sign_text:
-                    vision_line += f"; sign detected: '{sign_text}'"
-
-                # Build mode-appropriate prompt
-                if is_walking:
-                    # Walking mode - include steps, focus on pedestrian guidance
-                    user_type = "BLIND pedestrian WALKING"
-                    distance_info = f"Distance: {meters}m, {steps_remaining} steps"
-                    distance_rule = "- Start with distance: 'In X meters' or 'Walk X steps'"
-                    good_example = "'Walk 120 steps straight ahead for 84 meters.'"
-                    avoid_rules = "- Avoid visual verbs (see, look, watch)\n- Use pedestrian terms (walk, turn, cross)"
-                else:
-                    # Driving mode - NO steps, focus on driving guidance
-                    user_type = "driver in a VEHICLE"
-                    distance_info = f"Distance: {meters}m ({meters/1000:.1f} km)"
-                    distance_rule = "- Start with distance: 'In X meters' or 'Drive X kilometers'"
-                    good_example = "'Drive 500 meters ahead, then turn right.'"
-                    avoid_rules = "- Use driving terms (drive, turn, merge, exit)\n- NO walking/stepping references"
-
-                # Build mode-appropriate examples
-                if is_walking:
-                    obstacle_example = "Obstacles: chair desk ahead, move slightly left, then walk 120 steps straight."
-                    no_obstacle_example = "Walk 120 steps straight ahead for 84 meters."
-                    action_verb = "Walk"
-                else:
-                    obstacle_example = "Obstacles detected ahead, move left, then continue driving."
-                    no_obstacle_example = "Drive 48 meters straight ahead."
-                    action_verb = "Drive"
+                    vision_line += f"suggested direction: {steer}"
                 
-                prompt = (
-                    f"You are a navigation assistant for a {user_type}. "
-                    "Create ONE natural, conversational sentence for audio guidance. "
-                    f"Mode: {routing_mode.upper()}\n"
-                    f"Route: {compact_map}\n"
-                    f"Vision: {vision_line}\n"
-                    f"{distance_info}\n\n"
-                    "CRITICAL RULES:\n"
-                    "IF OBSTACLES DETECTED:\n"
-                    "  1. START: 'Obstacle detected on your [left/right/ahead]'\n"
-                    "  2. THEN: 'move [left/right]'\n"
-                    f"  3. THEN: 'then {action_verb.lower()} ahead'\n"
-                    "IF NO OBSTACLES:\n"
-                    f"  1. START with distance: '{action_verb} [distance] [direction]'\n\n"
-                    "FORMATTING:\n"
-                    "- Simple, natural English\n"
-                    "- NEVER use: watch, see, look\n"
-                    "- Maximum 15 words\n"
-                    f"{avoid_rules}\n\n"
-                    f"CORRECT with obstacle: '{obstacle_example}'\n"
-                    f"CORRECT without obstacle: '{no_obstacle_example}'\n\n"
-                    "Your sentence:"
-                )
-                url = os.getenv('GROK_API_BASE', 'https://api.x.ai/v1/chat/completions')
-                model = os.getenv('GROK_TEXT_MODEL', 'grok-2-latest')
-                headers = {'Authorization': f'Bearer {grok_key}', 'Content-Type': 'application/json'}
-                body = {
-                    'model': model,
-                    'messages': [{'role': 'user', 'content': prompt}],
-                    'temperature': 0.1,  # Lower for more consistent, faster responses
-                    'max_tokens': 50  # Reduced for faster response (20 words max)
-                }
+                    if sign_text:
+                        vision_line += f"; sign detected: '{sign_text}'"
+
+                    # Fill the mode-specific prompt template
+                    if is_walking:
+                        prompt = _PROMPT_TMPL_WALK.format(
+                            route=compact_map, vision=vision_line,
+                            distance_info=f"Distance: {meters}m, {steps_remaining} steps")
+                    else:
+                        prompt = _PROMPT_TMPL_DRIVE.format(
+                            mode=routing_mode.upper(), route=compact_map, vision=vision_line,
+                            distance_info=f"Distance: {meters}m ({meters/1000:.1f} km)")
+                    url = GROK_API_BASE
+                    model = GROK_TEXT_MODEL
+                    headers = {'Authorization': f'Bearer {grok_key}'}  # Content-Type set on the session
+                    body = {
+                        'model': model,
+                        'messages': [{'role': 'user', 'content': prompt}],
+                        'temperature': 0.1,  # Lower for more consistent, faster responses
+                        'max_tokens': 50  # Reduced for faster response (20 words max)
+                    }
                 
-                # Call Grok LLM for blind-friendly output (with strict 5-second timeout)
-                import time
-                start_time = time.time()
-                logger.info(f"🤖 [LLM] Calling Grok...")
-                resp = requests.post(url, headers=headers, data=json.dumps(body), timeout=5)  # STRICT 5-second timeout
-                resp.raise_for_status()
-                elapsed = time.time() - start_time
-                logger.info(f"⏱️  [LLM] Response received in {elapsed:.2f}s")
+                    # Call Grok LLM for blind-friendly output (with strict 5-second timeout)
+                    start_time = time.monotonic()
+                    logger.info(f"🤖 [LLM] Calling Grok...")
+                    # Submit through the bounded pool; the extra half second on
+                    # the future covers connection setup beyond the socket timeout
+                    fut = _LLM_POOL.submit(_GROK_SESSION.post, url, headers=headers,
+                                           data=orjson.dumps(body), timeout=5)  # STRICT 5-second timeout
+                    try:
+                        resp = fut.result(timeout=5.5)
+                    except FuturesTimeout:
+                        fut.cancel()
+                        raise requests.exceptions.Timeout('LLM call exceeded budget')
+                    resp.raise_for_status()
+                    elapsed = time.monotonic() - start_time
+                    logger.info(f"⏱️  [LLM] Response received in {elapsed:.2f}s")
                 
-                data_llm = resp.json()
-                llm_text = (data_llm.get('choices') or [{}])[0].get('message', {}).get('content', '')
-                llm_text = (llm_text or '').strip()
+                    data_llm = orjson.loads(resp.content)
+                    llm_text = (data_llm.get('choices') or [{}])[0].get('message', {}).get('content', '')
+                    llm_text = (llm_text or '').strip()
                 
-                if not llm_text:
-                    logger.error("❌ [LLM] Grok returned empty response!")
-                    raise Exception("LLM returned empty response")
+                    if not llm_text:
+                        logger.error("❌ [LLM] Grok returned empty response!")
+                        raise Exception("LLM returned empty response")
                 
-                logger.info(f"✅ [LLM] Grok response: {llm_text}")
+                    logger.info(f"✅ [LLM] Grok response: {llm_text}")
                 
-                # Ensure numeric distance appears; if missing, prepend a distance lead-in
-                import re
-                has_number = re.search(r"\b(\d+)\s*(meters?|m|steps?)\b", llm_text, re.IGNORECASE) is not None
-                if not has_number and meters > 0:
-                    lead = f"Proceed {meters} meters. "
-                    if steps_remaining > 0:
-                        lead = f"Proceed {meters} meters (about {steps_remaining} steps). "
-                    llm_text = lead + llm_text
-                    logger.info(f"📏 [LLM] Added distance prefix: {lead}")
+                    # Ensure numeric distance appears; if missing, prepend a distance lead-in
+                    has_number = _HAS_DISTANCE_RE.search(llm_text) is not None
+                    if not has_number and meters > 0:
+                        lead = f"Proceed {meters} meters. "
+                        if steps_remaining > 0:
+                            lead = f"Proceed {meters} meters (about {steps_remaining} steps). "
+                        llm_text = lead + llm_text
+                        logger.info(f"📏 [LLM] Added distance prefix: {lead}")
                 
-                instruction = llm_text
-                context = context + ' (LLM)' if '(LLM)' not in context else context
+                    instruction = llm_text
+                    context = context + ' (LLM)' if '(LLM)' not in context else context
                 
-            except requests.exceptions.Timeout:
-                logger.warning("⏱️  [LLM] Timeout after 5s - using fast fallback")
-                # Create instant fallback instruction (mode-aware)
-                if vision_enabled and hazards and len(hazards) > 0:
-                    action = "drive" if not is_walking else "walk"
-                    instruction = f"STOP! Obstacle detected. Move {steer}, then {action} ahead."
-                else:
-                    if is_walking and steps_remaining > 0:
-                        # Walking mode: combine steps + direction smoothly
-                        action = compact_map.lower() if compact_map else "continue"
-                        instruction = f"Walk {steps_remaining} steps, then {action}."
-                    else:
-                        # Driving mode: include distance in instruction
-                        if meters > 0:
-                            action = compact_map.lower() if compact_map else "continue straight"
-                            if meters >= 1000:
-                                instruction = f"Drive {meters/1000:.1f} kilometers, then {action}."
-                            else:
-                                instruction = f"Drive {meters} meters, then {action}."
-                        else:
-                            instruction = compact_map if compact_map else "Continue straight ahead."
-                context = context + ' (fast fallback)'
-            except requests.exceptions.HTTPError as e:
-                logger.error(f"❌ [LLM] API error: {e.response.status_code}")
-                # Create instant fallback instruction (mode-aware)
-                if vision_enabled and hazards and len(hazards) > 0:
-                    action = "drive" if not is_walking else "walk"
-                    instruction = f"STOP! Obstacle detected. Move {steer}, then {action} ahead."
-                else:
-                    if is_walking and steps_remaining > 0:
-                        # Walking mode: combine steps + direction smoothly
-                        action = compact_map.lower() if compact_map else "continue"
-                        instruction = f"Walk {steps_remaining} steps, then {action}."
-                    else:
-                        # Driving mode: include distance in instruction
-                        if meters > 0:
-                            action = compact_map.lower() if compact_map else "continue straight"
-                            if meters >= 1000:
-                                instruction = f"Drive {meters/1000:.1f} kilometers, then {action}."
-                            else:
-                                instruction = f"Drive {meters} meters, then {action}."
-                        else:
-                            instruction = compact_map if compact_map else "Continue straight ahead."
-                context = context + ' (error fallback)'
-            except Exception as e:
-                logger.error(f"❌ [LLM] Failed: {str(e)}")
-                # Create instant fallback instruction (mode-aware)
-                if vision_enabled and hazards and len(hazards) > 0:
-                    action = "drive" if not is_walking else "walk"
-                    instruction = f"STOP! Obstacle detected. Move {steer}, then {action} ahead."
-                else:
-                    if is_walking and steps_remaining > 0:
-                        # Walking mode: combine steps + direction smoothly
-                        action = compact_map.lower() if compact_map else "continue"
-                        instruction = f"Walk {steps_remaining} steps, then {action}."
-                    else:
-                        # Driving mode: include distance in instruction
-                        if meters > 0:
-                            action = compact_map.lower() if compact_map else "continue straight"
-                            if meters >= 1000:
-                                instruction = f"Drive {meters/1000:.1f} kilometers, then {action}."
-                            else:
-                                instruction = f"Drive {meters} meters, then {action}."
-                        else:
-                            instruction = compact_map if compact_map else "Continue straight ahead."
-                context = context + ' (fallback)'
-
-        # Prepare response
-        response_data = {
-            'success': True,
-            'instruction': instruction,
-            'distance': distance,
-            'duration': duration,
-            'context': context,
-            'priority': priority,
-            'vision_enabled': vision_enabled
-        }
-        
-        # Cache this instruction briefly - VERY short cache for immediate obstacle updates
-        cache_duration = 1 if vision_enabled else 10  # 1 second with vision (almost no latency), 10 without
-        _cache_response(cache_key, response_data, duration=cache_duration)
-        logger.info(f"📦 Cached instruction for {cache_duration}s - Vision: {vision_enabled}, Obstacles: {obstacle_state}")
+                except requests.exceptions.Timeout:
+                    logger.warning("⏱️  [LLM] Timeout after 5s - using fast fallback")
+                    instruction = _fallback_instruction()
+                    context = context + ' (fast fallback)'
+                except requests.exceptions.HTTPError as e:
+                    logger.error(f"❌ [LLM] API error: {e.response.status_code}")
+                    instruction = _fallback_instruction()
+                    context = context + ' (error fallback)'
+                except Exception as e:
+                    logger.error(f"❌ [LLM] Failed: {str(e)}")
+                    instruction = _fallback_instruction()
+                    context = context + ' (fallback)'
+
+            # Prepare response
+            response_data = {
+                'success': True,
+                'instruction': instruction,
+                'distance': distance,
+                'duration': duration,
+                'context': context,
+                'priority': priority,
+                'vision_enabled': vision_enabled
+            }
         
-        return jsonify(response_data)
+            # Prepared response is cached as serialized bytes
+            logger.info(f"📦 Caching instruction for {cache_duration}s - Vision: {vision_enabled}, Obstacles: {obstacle_state}")
+            return orjson.dumps(response_data)
+
+        payload = _coalesced_response(cache_key, _produce_unified_payload, duration=cache_duration)
+        return _json_response(payload)
         
     except Exception as e:
         import traceback
@@ -1669,27 +2204,100 @@ def get_unified_instruction():
         }), 500
 
 # ================= Existing TTS endpoint =================
-@app.route('/api/tts', methods=['POST'])
-def tts_api():
-    """Server-side TTS: returns an MP3 for clients that cannot use Web Speech."""
+# In-process espeak-ng via ctypes. The subprocess path forks a process and
+# round-trips a WAV through the filesystem per request (~10-30 ms of spawn
+# overhead alone); binding libespeak-ng keeps synthesis in memory. Loaded
+# lazily like the other optional dependencies; any failure leaves the
+# subprocess and gTTS fallbacks in charge.
+_espeak_state = None  # (lib, sample_rate, callback_ref) | False when unavailable
+_espeak_lock = threading.Lock()  # libespeak is not thread-safe
+_ESPEAK_RATE_PARAM = 1       # espeakRATE
+_ESPEAK_VOLUME_PARAM = 2     # espeakVOLUME
+_ESPEAK_CHARS_UTF8 = 1
+
+def _get_espeak():
+    global _espeak_state
+    if _espeak_state is None:
+        try:
+            import ctypes
+            lib = None
+            for name in ('libespeak-ng.so.1', 'libespeak.so.1'):
+                try:
+                    lib = ctypes.CDLL(name)
+                    break
+                except OSError:
+                    continue
+            if lib is None:
+                raise OSError('libespeak-ng not found')
+            # AUDIO_OUTPUT_SYNCHRONOUS: PCM is delivered to our callback
+            sample_rate = lib.espeak_Initialize(1, 0, None, 0)
+            if sample_rate <= 0:
+                raise OSError('espeak_Initialize failed')
+            _espeak_state = (lib, sample_rate, None)
+        except Exception as e:
+            logger.info(f"In-process espeak unavailable ({e}); using subprocess/gTTS fallback")
+            _espeak_state = False
+    return _espeak_state or None
+
+def _espeak_synth_wav(text: str, voice: str):
+    """Synthesize text to WAV bytes in process, or None if espeak is unavailable."""
+    state = _get_espeak()
+    if not state:
+        return None
+    import ctypes
+    import struct
+    lib, sample_rate, _ = state
     try:
-        # Prefer fast offline engines for low latency
-        data = request.get_json(silent=True) or {}
-        text = (data.get('text') or '').strip()
-        if not text:
-            return jsonify({'error': 'text is required'}), 400
-        # Choose engine: ESPEAK (fast, offline) → fallback to gTTS
-        prefer = (os.getenv('TTS_ENGINE') or '').lower()
-        use_espeak = prefer in ('espeak', 'fast', 'offline')
-        # Quick language detect for espeak voice
-        is_ar = any('\u0600' <= ch <= '\u06FF' for ch in text)
-        voice = 'ar' if is_ar else 'en+f3'
-        if use_espeak:
+        with _espeak_lock:
+            pcm = bytearray()
+            cb_type = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short),
+                                       ctypes.c_int, ctypes.c_void_p)
+
+            def _collect(wav, numsamples, events):
+                if wav and numsamples > 0:
+                    pcm.extend(ctypes.string_at(wav, numsamples * 2))
+                return 0
+
+            callback = cb_type(_collect)
+            lib.espeak_SetSynthCallback(callback)
+            lib.espeak_SetVoiceByName(voice.encode('ascii', 'ignore'))
+            lib.espeak_SetParameter(_ESPEAK_RATE_PARAM, 160, 0)
+            lib.espeak_SetParameter(_ESPEAK_VOLUME_PARAM, 180, 0)
+            encoded = text.encode('utf-8')
+            lib.espeak_Synth(encoded, len(encoded) + 1, 0, 1, 0,
+                             _ESPEAK_CHARS_UTF8, None, None)
+            lib.espeak_Synchronize()
+        if not pcm:
+            return None
+        # Minimal mono 16-bit WAV header around the PCM buffer
+        header = struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', 36 + len(pcm), b'WAVE',
+                             b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+                             b'data', len(pcm))
+        return header + bytes(pcm)
+    except Exception as e:
+        logger.warning(f"In-process espeak synthesis failed: {e}")
+        return None
+
+@lru_cache(maxsize=512)
+def _tts_audio(text: str, voice: str, use_espeak: bool):
+    """Synthesize audio for (text, voice), memoized.
+
+    Navigation phrases repeat constantly ("Continue straight ahead."), so a
+    cache hit returns the finished bytes with zero synthesis cost. Returns
+    (audio_bytes, mimetype, download_name), or None when no engine is
+    available; synthesis errors raise and are not cached. Worst case
+    ~50 KB x 512 entries is ~25 MB resident.
+    """
+    if use_espeak:
+        # In-process synthesis first; the subprocess path only runs when
+        # the library binding is unavailable
+        wav_bytes = _espeak_synth_wav(text, voice)
+        if wav_bytes is None:
             try:
                 import subprocess, tempfile
                 wav_tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
                 wav_tmp.close()
-                cmd = ['espeak', '-s', '160', '-a', '180', '-v', voice, '-w', wav_tmp.name, text[:500]]
+                cmd = ['espeak', '-s', '160', '-a', '180', '-v', voice, '-w', wav_tmp.name, text]
                 subprocess.run(cmd, capture_output=True, timeout=5, check=True)
                 with open(wav_tmp.name, 'rb') as f:
                     wav_bytes = f.read()
@@ -1697,17 +2305,50 @@ def tts_api():
                     os.unlink(wav_tmp.name)
                 except Exception:
                     pass
-                return send_file(io.BytesIO(wav_bytes), mimetype='audio/wav', download_name='tts.wav')
             except Exception as e:
                 logger.warning(f"Fast TTS (espeak) failed, falling back to gTTS: {e}")
-        if gTTS is None:
+                wav_bytes = None
+        if wav_bytes is not None:
+            return wav_bytes, 'audio/wav', 'tts.wav'
+    gTTS = _get_gtts()
+    if gTTS is None:
+        return None
+    # gTTS fallback (may be slower)
+    lang = 'ar' if voice == 'ar' else 'en'
+    fp = io.BytesIO()
+    gTTS(text=text, lang=lang, slow=False).write_to_fp(fp)
+    return fp.getvalue(), 'audio/mpeg', 'tts.mp3'
+
+@app.route('/api/tts', methods=['POST'])
+def tts_api():
+    """Server-side TTS: returns an MP3 for clients that cannot use Web Speech."""
+    try:
+        # Prefer fast offline engines for low latency
+        data = request.get_json(silent=True) or {}
+        text = (data.get('text') or '').strip()
+        if not text:
+            return jsonify({'error': 'text is required'}), 400
+        # Choose engine: ESPEAK (fast, offline) -> fallback to gTTS
+        prefer = (os.getenv('TTS_ENGINE') or '').lower()
+        use_espeak = prefer in ('espeak', 'fast', 'offline')
+        # Only the first 500 chars get synthesized, so truncate before the
+        # language sniff rather than scanning the whole submitted text
+        text = text[:500]
+        # Quick language detect for espeak voice
+        is_ar = contains_arabic(text)
+        voice = 'ar' if is_ar else 'en+f3'
+        result = _tts_audio(text, voice, use_espeak)
+        if result is None:
             return jsonify({'error': 'No TTS engine available'}), 503
-        # gTTS fallback (may be slower)
-        lang = 'ar' if is_ar else 'en'
-        fp = io.BytesIO()
-        gTTS(text=text[:500], lang=lang, slow=False).write_to_fp(fp)
-        fp.seek(0)
-        return send_file(fp, mimetype='audio/mpeg', download_name='tts.mp3')
+        audio, mimetype, download_name = result
+        # The audio is already one bytes object; build the Response directly
+        # instead of wrapping it in a BytesIO for send_file to re-chunk
+        return Response(
+            audio,
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'inline; filename="{download_name}"'},
+            direct_passthrough=True,
+        )
     except Exception as e:
         logger.error(f"TTS API error: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -3,9 +3,15 @@ Navigation Controller
 Main application logic that coordinates all components and handles user interactions
 """
 import logging
+import re
 import threading
+from collections import deque
+from dataclasses import dataclass
 import time
 import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
@@ -17,14 +23,141 @@ from services.osm_navigation_service import OSMNavigationService
 from services.speech_service import SpeechService
 from services.location_manager import LocationManager
 from services.cache_service import CacheService
+from services import geo_numba
 # Mock services only imported when test_mode=True (see __init__ below)
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Scalar Haversine support: precomputed conversion factor, the doubled
+# mean Earth radius, and the math functions bound to module globals so
+# the hot path skips the math-module attribute lookups
+_DEG2RAD = math.pi / 180.0
+_TWO_R = 2.0 * 6371000.0
+_sin = math.sin
+_cos = math.cos
+_asin = math.asin
+_sqrt = math.sqrt
+
+# Typo/phrase tables for _normalize_destination_input, hoisted so they are
+# built once instead of per call. The go-to variants all net out to removal:
+# the old sequential replace chain first rewrote them to 'go to' and then
+# deleted that too ('goto' was also listed twice; deduplicated here).
+_NAV_FIXES = {
+    'take me to': '',
+    'navigate to': '',
+    'search for': '',
+    'got o': '',
+    'gio to': '',
+    'gi to': '',
+    'goto': '',
+    'go to': '',
+    'find': '',
+}
+_LOC_FIXES = {
+    'mzyad mall': 'mazyad mall',
+    'mzyad': 'mazyad',
+    'mizyad': 'mazyad',
+    'mazyed': 'mazyad',
+    'mazayed': 'mazyad',
+    'capitol mall': 'capital mall',
+    'capitol': 'capital',
+    'capitl': 'capital',
+    'capatial': 'capital',
+}
+# One alternation per table: a single linear scan in C instead of one
+# whole-string str.replace pass per key. Longer phrases come first in the
+# dicts so they win over their prefixes at the same position.
+_NAV_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _NAV_FIXES)) + r')\b')
+_LOC_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _LOC_FIXES)) + r')\b')
+# ... and one translate pass for stray punctuation instead of four replaces
+_PUNCT_TABLE = str.maketrans(',;|.', '    ')
+
+# Selection parsing: one compiled scan for a digit or number word instead of
+# five substring passes that each rebuilt the word table
+_WORD_TO_NUM = {
+    '1': 1, 'one': 1,
+    '2': 2, 'two': 2,
+    '3': 3, 'three': 3,
+    '4': 4, 'four': 4,
+    '5': 5, 'five': 5,
+}
+_SEL_RE = re.compile(r'\b(1|2|3|4|5|one|two|three|four|five)\b')
+
+@dataclass(slots=True)
+class ArrivalTracker:
+    """Mutable waypoint-arrival state, grouped so the monitor loop touches
+    one compact object per tick instead of attributes scattered across the
+    controller. Times are time.monotonic() floats."""
+    confirmations: int = 0
+    required: int = 2
+    last_distance: Optional[float] = None
+    last_instruction_time: Optional[float] = None
+    min_interval: float = 8.0  # seconds between spoken instructions
+    last_step_id: int = -1  # duplicate suppression: int compare, not text
+
+    def reset(self) -> None:
+        self.confirmations = 0
+        self.last_distance = None
+        self.last_instruction_time = None
+        self.last_step_id = -1
+
+
 class NavigationController:
     """Main controller for the navigation application"""
     
+    # Fixed tuning constants, class-level so per-tick reads resolve on the
+    # type instead of re-probing each instance dict (nothing mutates them)
+    simulation_speed = 5.0  # meters per second (walking speed)
+    location_change_threshold = 8.0  # minimum meters moved to consider real movement (increased from 4.0)
+    arrival_distance_threshold = 25.0  # meters to consider waypoint reached (was 15.0)
+    arrival_hysteresis = 15.0  # must have been > threshold + hysteresis before arriving (was 10.0)
+    # Off-route detection: perpendicular deviation from the nearest route
+    # segment, confirmed over consecutive checks so one bad fix can't
+    # trigger a spoken reroute
+    off_route_threshold = 30.0
+    required_off_route_confirmations = 3
+    # Scalar Kalman gain parameters for GPS smoothing: measurement noise
+    # dominates process noise, so jitter is damped while sustained motion
+    # still tracks within a few fixes
+    _kf_measurement_var = 5.0
+    _kf_process_var = 0.1
+    # Stationary detection over the last few fixes: any single hop above
+    # the moving threshold flips to moving; a full window summing below
+    # the idle threshold flips to idle
+    _idle_window_m = 3.0
+    _moving_delta_m = 5.0
+    # A fix implying faster-than-vehicle travel from the recent median
+    # position is a multipath/cold-start artifact, not movement
+    _spike_speed_mps = 30.0  # need 2 consecutive checks within threshold
+    # Movement threshold restated as squared degrees of arc, so the movement
+    # check compares squared distances and never takes a square root
+    _loc_change_threshold_deg_sq = (location_change_threshold / geo_numba.DEG_TO_M) ** 2
+    
+    # Slots keep per-instance state in a fixed C-level array rather than a
+    # dict probe per attribute access. last_activity is set externally by
+    # the session manager in app.py.
+    __slots__ = (
+        'test_mode', 'location_service', 'places_service', 'navigation_service',
+        'speech_service', 'location_manager', 'cache_service', '_io_pool',
+        'current_destination', 'is_navigating',
+        'last_announced_instruction', '_arrival',
+        'navigation_thread', 'instruction_event', '_loc_updated',
+        'text_only_mode', '_state_lock', 'waiting_for_selection',
+        'search_results', 'pending_save_location', 'simulation_mode',
+        'last_simulation_update', 'last_known_location', '_wp_lats',
+        '_wp_lons', '_route_lats', '_route_lngs', '_route_wp_end_idx',
+        '_dist_buf',
+        '_arr_far_cached', '_off_route_confirmations',
+        '_kf_lat', '_kf_lng', '_kf_p',
+        '_motion_state', '_move_deltas', '_prev_fix', '_fix_history',
+        '_reroute_inflight',
+        '_last_arrival_check_time', 'last_movement_time',
+        '_last_movement_monotonic',
+        'routing_mode', '_cmd_handlers',
+        '_nav_cv', '_shutdown', '_cache_pool', 'last_activity',
+    )
+    
     def __init__(self, test_mode=False):
         """Initialize the navigation controller"""
         try:
@@ -48,46 +181,119 @@ class NavigationController:
             self.speech_service = SpeechService()
             self.location_manager = LocationManager()
             self.cache_service = CacheService()
+            # Small pool for overlapping route/cache I/O with TTS; sized for
+            # one in-flight directions call plus one background cache write
+            self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='nav-io')
+            # Single worker so fire-and-forget cache writes stay serialized
+            # (CacheService does no locking of its own) while the user-facing
+            # thread moves straight on to TTS
+            self._cache_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cache-io')
             
             # Application state
             self.current_destination = None
             self.is_navigating = False
-            self.last_instruction_time = None
             self.last_announced_instruction = None  # Track last announced instruction
-            self.navigation_thread = None
+            # Arrival/announcement pacing state lives on one small object
+            self._arrival = ArrivalTracker()
+            # One long-lived monitor worker instead of a fresh thread per
+            # navigation; it parks on _nav_cv between sessions
+            self._nav_cv = threading.Condition()
+            self._shutdown = False
+            self.navigation_thread = threading.Thread(
+                target=self._monitor_forever, daemon=True, name='nav-monitor')
+            self.navigation_thread.start()
+            # Signalled whenever a new instruction is announced (or navigation
+            # ends) so push clients (SSE) wake up without polling
+            self.instruction_event = threading.Event()
+            # Signalled by set_current_location when GPS actually updates, so
+            # the monitor loop blocks on real movement instead of waking on a
+            # timer only to find nothing changed
+            self._loc_updated = threading.Event()
             
             # Interaction mode
             self.text_only_mode = True
             
             # User interaction state
+            # _state_lock guards paired updates to the selection state; it is
+            # per-instance so sessions never contend with each other
+            self._state_lock = threading.Lock()
             self.waiting_for_selection = False
             self.search_results = []
             self.pending_save_location = None
             
             # Location simulation for testing
             self.simulation_mode = False
-            self.simulation_speed = 5.0  # meters per second (walking speed)
             self.last_simulation_update = None
             
-            # Instruction throttling
-            self.min_instruction_interval = 8.0  # seconds between spoken instructions
-            
             # Track location changes for better waypoint detection
             self.last_known_location = None
-            self.location_change_threshold = 8.0  # minimum meters moved to consider real movement (increased from 4.0)
             
-            # Waypoint arrival detection - INCREASED to prevent GPS drift false positives
-            self.arrival_distance_threshold = 25.0  # meters to consider waypoint reached (was 15.0)
-            self.arrival_hysteresis = 15.0  # must have been > threshold + hysteresis before arriving (was 10.0)
-            self._last_distance_to_waypoint = None
+            # Per-route waypoint coordinates as parallel float64 arrays
+            # (structure-of-arrays); built once per route so per-tick distance
+            # math indexes contiguous buffers instead of chasing nested dicts
+            self._wp_lats = None
+            self._wp_lons = None
+            # Full route geometry as parallel arrays, for batch distance ops
+            # (nearest-point / off-route checks) over every coordinate at once
+            self._route_lats = None
+            self._route_lngs = None
+            self._route_wp_end_idx = None
+            self._dist_buf = None
+            self._off_route_confirmations = 0
+
+            # Kalman filter state for GPS smoothing; unseeded until the
+            # first fix arrives
+            self._kf_lat = None
+            self._kf_lng = None
+            self._kf_p = 1.0
+
+            # Motion state machine: 'idle' / 'moving' / 'arrived_pending',
+            # fed by the rolling window of per-fix movement deltas
+            self._motion_state = 'idle'
+            self._move_deltas = deque(maxlen=5)
+            self._prev_fix = None
+            # Recent accepted fixes as (monotonic_t, lat, lng) for the
+            # rolling-median spike filter
+            self._fix_history = deque(maxlen=5)
+            # True while a background reroute fetch is outstanding
+            self._reroute_inflight = False
+
+            # Waypoint arrival detection state (thresholds are class constants)
+            # Precomputed 'previously far' edge of the arrival envelope so the
+            # 2 s arrival check does not re-add the constants every tick
+            self._arr_far_cached = self.arrival_distance_threshold + self.arrival_hysteresis
             self._last_arrival_check_time = None
             self.last_movement_time = None  # timestamp of last significant movement
-            self.arrival_confirmations = 0  # require multiple confirmations before advancing
-            self.required_arrival_confirmations = 2  # need 2 consecutive checks within threshold
+            self._last_movement_monotonic = 0.0  # stamped on every GPS update
             
             # Routing mode: 'foot' for walking, 'car' for driving
             self.routing_mode = 'foot'  # Default to walking (safest for blind users)
-            
+
+            # Command dispatch table: O(1) lookup instead of a 13-way elif
+            # chain where late commands paid a dozen string compares each.
+            # No-argument handlers are wrapped to the common (command) shape.
+            self._cmd_handlers = {
+                'navigate': self._handle_navigate_command,
+                'search': self._handle_search_command,
+                'search_nearby': self._handle_nearby_search_command,
+                'repeat_instruction': lambda cmd: self._handle_repeat_instruction(),
+                'next_instruction': lambda cmd: self._handle_next_instruction(),
+                'current_location': lambda cmd: self._handle_current_location_request(),
+                'save_location': lambda cmd: self._handle_save_location_request(),
+                'stop_navigation': lambda cmd: self._handle_stop_navigation(),
+                'clear': lambda cmd: self._handle_clear_navigation(),
+                'help': lambda cmd: self._handle_help_request(),
+                'simulate': self._handle_simulation_command,
+                'manual_advance': self._handle_manual_advance_command,
+                'reroute': self._handle_reroute_command,
+                'unknown': self._handle_unknown_command,
+                'error': self._handle_command_error,
+            }
+
+            # Compile the distance kernel now so the monitor loop's first
+            # per-tick call does not pay the JIT cost mid-navigation
+            geo_numba.warm()
+
             logger.info("Navigation controller initialized successfully")
             
         except Exception as e:
@@ -126,6 +332,40 @@ class NavigationController:
                 self.speech_service.speak("Error starting navigation system.")
             return False
     
+    def reset(self) -> None:
+        """
+        Reset per-session state so this controller can be reused for a new
+        session without rebuilding its services
+        """
+        try:
+            self._stop_navigation()
+            # The previous session's GPS fix must not leak to the next user,
+            # and neither may the spike filter's rolling median - otherwise
+            # the new user's first genuine fix reads as a teleport and is
+            # dropped (_stop_navigation already cleared the motion tracker)
+            self.location_service.clear()
+            self._fix_history.clear()
+            self._prev_fix = None
+            self.pending_save_location = None
+            self.simulation_mode = False
+            self.last_simulation_update = None
+            self._arrival.reset()
+            self._last_arrival_check_time = None
+            self.last_movement_time = None
+            self.routing_mode = 'foot'
+            self.instruction_event.clear()
+            self._loc_updated.clear()
+            # stop() retires the monitor worker before a controller goes
+            # back to the pool; a recycled controller needs it running again
+            self._shutdown = False
+            if not self.navigation_thread.is_alive():
+                self.navigation_thread = threading.Thread(
+                    target=self._monitor_forever, daemon=True, name='nav-monitor')
+                self.navigation_thread.start()
+            logger.info("Navigation controller reset for reuse")
+        except Exception as e:
+            logger.error(f"Error resetting navigation controller: {str(e)}")
+
     def stop(self) -> None:
         """Stop the navigation application"""
         try:
@@ -138,6 +378,11 @@ class NavigationController:
             # Stop voice recognition
             self.speech_service.stop_continuous_listening()
             
+            # Retire the persistent monitor worker
+            self._shutdown = True
+            with self._nav_cv:
+                self._nav_cv.notify()
+            
             self.speech_service.speak("Navigation system stopped. Goodbye!")
             
         except Exception as e:
@@ -155,12 +400,21 @@ class NavigationController:
             True if location was set successfully
         """
         try:
+            if self._is_gps_spike(latitude, longitude):
+                # Drop the outlier: nothing downstream sees it, and the
+                # caller is told the fix was not applied
+                return False
+
             success = self.location_service.set_current_location(latitude, longitude)
             
             if success:
                 # Don't announce location updates during normal operation - too noisy!
                 # Only log them silently
-                logger.debug(f"Current location updated: {latitude}, {longitude}")
+                logger.debug("Current location updated: %s, %s", latitude, longitude)
+                self._track_motion(latitude, longitude)
+                self._kf_update(latitude, longitude)
+                self._last_movement_monotonic = time.monotonic()
+                self._loc_updated.set()  # Wake the navigation monitor
             else:
                 logger.error(f"Failed to set current location: {latitude}, {longitude}")
             
@@ -188,42 +442,7 @@ class NavigationController:
             # SECOND: Process standard commands
             command = self.speech_service.process_voice_command(command_text)
             
-            if command['type'] == 'navigate':
-                self._handle_navigate_command(command)
-            elif command['type'] == 'search':
-                self._handle_search_command(command)
-            elif command['type'] == 'search_nearby':
-                self._handle_nearby_search_command(command)
-            elif command['type'] == 'repeat_instruction':
-                self._handle_repeat_instruction()
-            elif command['type'] == 'next_instruction':
-                self._handle_next_instruction()
-            elif command['type'] == 'current_location':
-                self._handle_current_location_request()
-            elif command['type'] == 'save_location':
-                self._handle_save_location_request()
-            elif command['type'] == 'stop_navigation':
-                self._handle_stop_navigation()
-            elif command['type'] == 'clear' or 'clear' in command.get('raw_command', '').lower():
-                self._handle_clear_navigation()
-            elif command['type'] == 'help':
-                self._handle_help_request()
-            elif command['type'] == 'simulate':
-                self._handle_simulation_command(command)
-            elif command['type'] == 'manual_advance':
-                self._handle_manual_advance_command(command)
-            elif command['type'] == 'reroute':
-                self._handle_reroute_command(command)
-            elif command['type'] == 'unknown':
-                # THIRD: Text-only fallback for navigation (lowest priority)
-                if self.text_only_mode:
-                    destination = command.get('raw_command', '').strip()
-                    if destination:
-                        logger.info(f"Text-only fallback: navigating to '{destination}'")
-                        return self._handle_navigate_command({'destination': destination})
-                self._handle_unknown_command(command)
-            elif command['type'] == 'error':
-                self._handle_command_error(command)
+            self._cmd_handlers.get(command['type'], self._handle_unknown_command)(command)
             
         except Exception as e:
             logger.error(f"Error handling voice command: {str(e)}")
@@ -237,16 +456,15 @@ class NavigationController:
             destination = self._normalize_destination_input(destination_raw)
             logger.info(f"Navigate request: raw='{destination_raw}' normalized='{destination}'")
             
-            if not self.location_service.get_current_location():
+            # Fetch once and reuse; each call takes the location service lock
+            current_location = self.location_service.get_current_location()
+            if not current_location:
                 self.speech_service.speak("Please allow location access to use navigation.")
                 return
             
             # Speak using a friendly case
             self.speech_service.speak(f"Searching for {destination.title()}...")
             
-            # Search for the destination
-            current_location = self.location_service.get_current_location()
-            
             # Check cache first
             cached_results = self.cache_service.get_cached_places_search(destination, current_location)
             
@@ -256,7 +474,8 @@ class NavigationController:
             else:
                 places = self.places_service.search_places(destination, current_location)
                 if places:
-                    self.cache_service.cache_places_search(destination, current_location, places)
+                    self._cache_pool.submit(self.cache_service.cache_places_search,
+                                            destination, current_location, places)
             
             if not places:
                 self.speech_service.speak(f"Sorry, I couldn't find {destination}. Please try a different search term.")
@@ -278,14 +497,13 @@ class NavigationController:
         try:
             query = command['query']
             
-            if not self.location_service.get_current_location():
+            current_location = self.location_service.get_current_location()
+            if not current_location:
                 self.speech_service.speak("Please allow location access to search for places.")
                 return
             
             self.speech_service.speak(f"Searching for {query}...")
             
-            current_location = self.location_service.get_current_location()
-            
             # Check cache first
             cached_results = self.cache_service.get_cached_places_search(query, current_location)
             
@@ -294,7 +512,8 @@ class NavigationController:
             else:
                 places = self.places_service.search_places(query, current_location)
                 if places:
-                    self.cache_service.cache_places_search(query, current_location, places)
+                    self._cache_pool.submit(self.cache_service.cache_places_search,
+                                            query, current_location, places)
             
             if not places:
                 self.speech_service.speak(f"Sorry, I couldn't find any {query} nearby.")
@@ -316,14 +535,13 @@ class NavigationController:
                 q = q.replace(token, '')
             query = q.strip() or raw_query
             
-            if not self.location_service.get_current_location():
+            current_location = self.location_service.get_current_location()
+            if not current_location:
                 self.speech_service.speak("Please allow location access to search for nearby places.")
                 return
             
             self.speech_service.speak(f"Searching for {query}...")
             
-            current_location = self.location_service.get_current_location()
-            
             # Check cache first
             cached_results = self.cache_service.get_cached_places_search(query, current_location)
             
@@ -332,7 +550,8 @@ class NavigationController:
             else:
                 places = self.places_service.search_places(query, current_location, radius=2000)
                 if places:
-                    self.cache_service.cache_places_search(query, current_location, places)
+                    self._cache_pool.submit(self.cache_service.cache_places_search,
+                                            query, current_location, places)
             
             if not places:
                 self.speech_service.speak(f"Sorry, I couldn't find any {query} nearby.")
@@ -350,8 +569,6 @@ class NavigationController:
             self.search_results = places
             self.waiting_for_selection = True
             
-            current_location = self.location_service.get_current_location()
-            
             # Only provide essential voice feedback since options are shown on screen
             if for_navigation:
                 self.speech_service.speak(f"Found {len(places)} options. Please select a number.", priority="high")
@@ -362,14 +579,18 @@ class NavigationController:
             # This prevents voice overlapping and annoying repetition
             logger.info(f"Presenting {len(places)} search options on screen (silent mode)")
             
-            # Log the options for debugging but don't speak them
-            for i, place in enumerate(places[:5], 1):  # Limit to 5 options
-                place_info = self.places_service.format_place_for_speech(
-                    place, 
-                    include_distance=True, 
-                    current_location=current_location
-                )
-                logger.info(f"Option {i}: {place_info}")
+            # Log the options for debugging but don't speak them. Formatting
+            # runs a distance calculation per place, so skip the whole loop
+            # unless a DEBUG handler will actually show it
+            if logger.isEnabledFor(logging.DEBUG):
+                current_location = self.location_service.get_current_location()
+                for i, place in enumerate(places[:5], 1):  # Limit to 5 options
+                    place_info = self.places_service.format_place_for_speech(
+                        place, 
+                        include_distance=True, 
+                        current_location=current_location
+                    )
+                    logger.debug("Option %d: %s", i, place_info)
             
             # In text-only mode, auto-select ONLY if there's exactly one result
             # If multiple results, always let user choose
@@ -396,17 +617,18 @@ class NavigationController:
                 return
             
             # Try to extract number
-            for i in range(1, 6):
-                if str(i) in command_text or self._number_to_word(i) in command_text:
-                    if i <= len(self.search_results):
-                        selected_place = self.search_results[i-1]
-                        self.waiting_for_selection = False
-                        self.search_results = []
-                        
-                        # Simple confirmation without details (details already on screen)
-                        logger.info(f"User selected option {i}: {selected_place['name']}")
-                        self._start_navigation_to_place(selected_place)
-                        return
+            m = _SEL_RE.search(command_text)
+            if m:
+                i = _WORD_TO_NUM[m.group(1)]
+                if i <= len(self.search_results):
+                    selected_place = self.search_results[i-1]
+                    self.waiting_for_selection = False
+                    self.search_results = []
+                    
+                    # Simple confirmation without details (details already on screen)
+                    logger.info(f"User selected option {i}: {selected_place['name']}")
+                    self._start_navigation_to_place(selected_place)
+                    return
             
             # Brief error message without repeating instructions
             self.speech_service.speak("Please select a valid number or type cancel.", priority="high")
@@ -415,52 +637,19 @@ class NavigationController:
             logger.error(f"Error handling selection: {str(e)}")
             self.speech_service.speak("Error processing selection.")
     
-    def _number_to_word(self, num: int) -> str:
-        """Convert number to word"""
-        words = {1: 'one', 2: 'two', 3: 'three', 4: 'four', 5: 'five'}
-        return words.get(num, str(num))
-    
     def _normalize_destination_input(self, text: str) -> str:
         """Normalize destination text (typo fixes, spacing)"""
         try:
             t = text.strip().lower()
             
-            # Common command phrase fixes
-            navigation_fixes = {
-                'got o': 'go to',
-                'goto': 'go to',
-                'goto': 'go to',
-                'gio to': 'go to',
-                'gi to': 'go to',
-                'take me to': '',
-                'navigate to': '',
-                'go to': '',  # Remove navigation phrases
-                'find': '',
-                'search for': ''
-            }
-            
-            for wrong, right in navigation_fixes.items():
-                t = t.replace(wrong, right)
-            
-            # Common location fixes
-            location_corrections = {
-                'mzyad': 'mazyad',
-                'mzyad mall': 'mazyad mall',
-                'mizyad': 'mazyad',
-                'mazyed': 'mazyad',
-                'mazayed': 'mazyad',
-                'capitol': 'capital',
-                'capitol mall': 'capital mall',
-                'capitl': 'capital',
-                'capatial': 'capital'
-            }
+            # Strip command phrases / fix command typos
+            t = _NAV_RE.sub(lambda m: _NAV_FIXES[m.group(1)], t)
             
-            for wrong, right in location_corrections.items():
-                t = t.replace(wrong, right)
+            # Fix common location typos
+            t = _LOC_RE.sub(lambda m: _LOC_FIXES[m.group(1)], t)
             
             # Remove stray punctuation
-            for ch in [',', ';', '|', '.']:
-                t = t.replace(ch, ' ')
+            t = t.translate(_PUNCT_TABLE)
             
             # Collapse whitespace
             t = ' '.join(t.split())
@@ -477,36 +666,49 @@ class NavigationController:
                 self.speech_service.speak("Current location not available for navigation.")
                 return
             
-            self.speech_service.speak(f"Starting navigation to {place['name']}...")
-            
-            # Check for cached route (include routing mode in cache lookup)
+            # Check for cached route (include routing mode in cache lookup);
+            # only reuse cache if it matches current navigation engine (OSRM)
             cached_route = self.cache_service.get_cached_route(current_location, place['location'], profile=self.routing_mode)
+            use_cached = bool(cached_route and isinstance(cached_route, dict) and cached_route.get('engine') == 'osrm')
+            
+            route_future = None
+            if not use_cached:
+                if cached_route:
+                    logger.info("Ignoring incompatible cached route; recalculating with OSRM")
+                # Kick the OSRM request off now so the HTTP round trip runs
+                # while the announcement below is still being spoken
+                logger.info(f"🚶/🚗 [NAVIGATION] Calculating route with mode: {self.routing_mode.upper()}")
+                route_future = self._io_pool.submit(
+                    self.navigation_service.get_directions,
+                    current_location, place['location'], profile=self.routing_mode
+                )
             
-            # Only reuse cache if it matches current navigation engine (OSRM)
-            if cached_route and isinstance(cached_route, dict) and cached_route.get('engine') == 'osrm':
+            self.speech_service.speak(f"Starting navigation to {place['name']}...")
+            
+            if use_cached:
                 route = cached_route
                 logger.info(f"Using cached route for {self.routing_mode.upper()} mode")
                 # Important: Store the cached route in the navigation service
                 self.navigation_service.current_route = cached_route
                 self.navigation_service.current_step_index = 0
             else:
-                if cached_route:
-                    logger.info("Ignoring incompatible cached route; recalculating with OSRM")
-                # Get directions using current routing mode (foot/car)
-                logger.info(f"🚶/🚗 [NAVIGATION] Calculating route with mode: {self.routing_mode.upper()}")
-                route = self.navigation_service.get_directions(current_location, place['location'], profile=self.routing_mode)
+                route = route_future.result(timeout=15)
                 if route:
                     logger.info(f"✅ [NAVIGATION] Route received: {route.get('distance', 0)}m, {route.get('duration', 0)}s")
-                    self.cache_service.cache_route(current_location, place['location'], route, profile=self.routing_mode)
+                    self._cache_pool.submit(self.cache_service.cache_route,
+                                            current_location, place['location'], route,
+                                            profile=self.routing_mode)
             
             if not route:
                 self.speech_service.speak("Unable to calculate route. Please try again.")
                 return
             
             # Set destination and start navigation
+            self._build_waypoint_arrays(route)
             self.current_destination = place
             self.is_navigating = True
             self.last_announced_instruction = None  # Clear any previous instruction
+            self._arrival.last_step_id = -1
             self.last_known_location = None  # Reset location tracking
             
             # Add to history
@@ -517,8 +719,9 @@ class NavigationController:
             if summary:
                 self.speech_service.speak(summary)
             
-            # Start navigation monitoring (only if we have instructions)
-            logger.info(f"Route data: {route}")
+            # Start navigation monitoring (only if we have instructions).
+            # %-form defers the (large) route repr until a DEBUG handler asks
+            logger.debug("Route data: %s", route)
             if route and route.get('instructions'):
                 logger.info(f"Starting navigation with {len(route['instructions'])} instructions")
                 # The navigation service already has the route from get_directions()
@@ -543,11 +746,11 @@ class NavigationController:
             # Get current route data from navigation service
             route_data = self.navigation_service.current_route
             
-            logger.info(f"Announcing instruction - route_data: {route_data is not None}, current_location: {current_location is not None}")
+            logger.debug("Announcing instruction - route_data: %s, current_location: %s", route_data is not None, current_location is not None)
             
             instruction = self.navigation_service.get_current_instruction(route_data, current_location)
             
-            logger.info(f"Got instruction: {instruction is not None}")
+            logger.debug("Got instruction: %s", instruction is not None)
             
             if instruction:
                 # Handle both string (old format) and dict (new format) responses
@@ -556,15 +759,20 @@ class NavigationController:
                 else:
                     instruction_text = str(instruction)
                 
-                # Prevent announcing the same instruction multiple times
-                if instruction_text == self.last_announced_instruction:
-                    logger.debug(f"Skipping duplicate instruction: {instruction_text}")
+                # Prevent announcing the same step multiple times; comparing
+                # the step index is a single int compare vs an O(len) string
+                # equality on the spoken text every poll
+                step_id = self.navigation_service.current_step_index
+                if step_id == self._arrival.last_step_id:
+                    logger.debug(f"Skipping duplicate announcement for step {step_id}")
                     return
                 
                 # Use high priority for navigation instructions to ensure they're heard
                 self.speech_service.speak(instruction_text, priority="high")
-                self.last_instruction_time = datetime.now()
+                self._arrival.last_instruction_time = time.monotonic()
                 self.last_announced_instruction = instruction_text
+                self._arrival.last_step_id = step_id
+                self.instruction_event.set()  # Wake any push (SSE) listeners
                 logger.info(f"Announced navigation instruction: {instruction_text}")
             elif self.is_navigating:
                 # Check if we actually reached destination or if there's an error
@@ -579,18 +787,44 @@ class NavigationController:
             logger.error(f"Error announcing instruction: {str(e)}")
     
     def _start_navigation_monitoring(self) -> None:
-        """Start background thread to monitor navigation progress"""
+        """Wake the persistent monitor worker for the new navigation"""
         try:
-            if self.navigation_thread and self.navigation_thread.is_alive():
-                return
-            
-            self.navigation_thread = threading.Thread(target=self._navigation_monitor_loop)
-            self.navigation_thread.daemon = True
-            self.navigation_thread.start()
+            with self._nav_cv:
+                self._nav_cv.notify()
             
         except Exception as e:
             logger.error(f"Error starting navigation monitoring: {str(e)}")
     
+    def _monitor_forever(self) -> None:
+        """
+        Persistent monitor worker: parks on the condition between
+        navigations so starting a session never pays thread creation
+        """
+        while True:
+            with self._nav_cv:
+                self._nav_cv.wait_for(lambda: self.is_navigating or self._shutdown)
+            if self._shutdown:
+                break
+            try:
+                self._navigation_monitor_loop()
+            except Exception as e:
+                logger.error(f"Error in navigation monitor worker: {str(e)}")
+        logger.info("Navigation monitor worker shut down")
+    
+    def _adaptive_interval(self) -> float:
+        """Monitor poll timeout scaled to distance from the next waypoint.
+
+        At walking pace (~1.4 m/s) a waypoint 60 m out cannot be reached
+        for most of a minute, so polling tightens only as it approaches:
+        one second of travel margin per 6 m, clamped between 0.5 s (snappy
+        arrival detection at the turn) and 10 s (far from any event).
+        Falls back to the configured interval until a distance is known.
+        """
+        d = self._arrival.last_distance
+        if d is None:
+            return Config.NAVIGATION_UPDATE_INTERVAL
+        return max(0.5, min(10.0, d / 6.0))
+
     def _navigation_monitor_loop(self) -> None:
         """Background loop to monitor navigation progress"""
         logger.info("Navigation monitoring started")
@@ -607,12 +841,27 @@ class NavigationController:
         time.sleep(2)
         self._announce_current_instruction()
         
-        last_instruction_check = time.time()
-        last_reroute_check = time.time()
+        # Monotonic clock for the interval gates: immune to NTP steps and
+        # DST jumps that could double-fire or stall the checks
+        monotonic = time.monotonic  # bind the hot lookups once per session
+        loc_wait = self._loc_updated.wait
+        loc_clear = self._loc_updated.clear
+        t = self._arrival  # one object holds all arrival pacing state
+        last_instruction_check = monotonic()
+        last_reroute_check = monotonic()
         
         while self.is_navigating:
             try:
-                time.sleep(Config.NAVIGATION_UPDATE_INTERVAL)
+                # Block until GPS actually updates rather than sleeping and
+                # re-checking; the timeout keeps simulation and shutdown live.
+                # The timeout adapts to waypoint distance, and a stationary
+                # user needs no tight cadence at all, so idle triples it
+                # (a fresh fix still wakes the loop instantly either way)
+                timeout = self._adaptive_interval()
+                if self._motion_state == 'idle' and not self.simulation_mode:
+                    timeout *= 3
+                gps_updated = loc_wait(timeout=timeout)
+                loc_clear()
                 
                 if not self.is_navigating:
                     break
@@ -621,10 +870,23 @@ class NavigationController:
                 if self.simulation_mode:
                     self._update_simulated_location()
                 
-                current_time = time.time()
+                current_time = monotonic()
+                
+                # GPS silent for over 6 s: nothing can have moved, so skip
+                # the reroute and arrival work entirely - the common case
+                # for a user paused at a crossing. Simulation feeds the
+                # location service directly and never stamps the GPS
+                # timestamp, so it is exempt
+                if (current_time - self._last_movement_monotonic > 6.0
+                        and not self.simulation_mode):
+                    logger.debug("No recent GPS updates; monitor idle")
+                    continue
                 
-                # Check for auto-rerouting every 10 seconds
-                if current_time - last_reroute_check >= 10.0:
+                # Check for auto-rerouting every 10 seconds; a user who is
+                # not moving cannot have left the route, so only the moving
+                # states pay for the off-route geometry
+                if current_time - last_reroute_check >= 10.0 and \
+                        self._motion_state != 'idle':
                     last_reroute_check = current_time
                     if self._has_location_changed_significantly():
                         logger.debug("Checking for auto-rerouting due to location change")
@@ -634,66 +896,64 @@ class NavigationController:
                 if current_time - last_instruction_check >= 2.0:
                     last_instruction_check = current_time
                     
-                    # Require recent movement to consider arrival at waypoint
-                    moved_recently = (
-                        self.last_movement_time is not None and
-                        (current_time - self.last_movement_time) <= 6.0
-                    )
-                    if not moved_recently:
-                        logger.debug("No recent movement; skipping arrival check")
+                    # Timed out with no GPS update and no simulation feeding
+                    # locations: nothing can have moved, skip the whole check
+                    if not gps_updated and not self.simulation_mode:
+                        logger.debug("No location update this interval; skipping arrival check")
                         continue
                     
                     distance_to_wp = self._distance_to_next_waypoint()
                     if distance_to_wp is not None:
-                        logger.debug(f"Distance to next waypoint: {distance_to_wp:.1f}m (last={self._last_distance_to_waypoint})")
+                        # Bind last distance and the precomputed envelope to
+                        # locals; this arithmetic runs every 2 s for the trip
+                        last_d = t.last_distance
+                        logger.debug("Distance to next waypoint: %.1fm (last=%s)", distance_to_wp, last_d)
                         # Hysteresis: require previously far, now within threshold
-                        previously_far = (
-                            self._last_distance_to_waypoint is None or
-                            self._last_distance_to_waypoint > (self.arrival_distance_threshold + self.arrival_hysteresis)
-                        )
+                        previously_far = last_d is None or last_d > self._arr_far_cached
                         now_arrived = distance_to_wp <= self.arrival_distance_threshold
                         getting_closer = (
-                            self._last_distance_to_waypoint is None or
-                            distance_to_wp <= self._last_distance_to_waypoint - 2.0  # at least approaching by 2m
+                            last_d is None or
+                            distance_to_wp <= last_d - 2.0  # at least approaching by 2m
                         )
                         
-                        # Only update last distance when movement is detected
-                        if moved_recently:
-                            self._last_distance_to_waypoint = distance_to_wp
+                        # The outer GPS-silence gate guarantees this reading
+                        # reflects recent movement
+                        t.last_distance = distance_to_wp
                         
                         if previously_far and now_arrived and getting_closer:
                             # Increment arrival confirmation counter
-                            self.arrival_confirmations += 1
-                            logger.debug(f"Arrival confirmation {self.arrival_confirmations}/{self.required_arrival_confirmations} at {distance_to_wp:.1f}m")
+                            t.confirmations += 1
+                            self._motion_state = 'arrived_pending'
+                            logger.debug("Arrival confirmation %d/%d at %.1fm", t.confirmations, t.required, distance_to_wp)
                             
                             # Require multiple consecutive confirmations to prevent GPS drift false positives
-                            if self.arrival_confirmations >= self.required_arrival_confirmations:
+                            if t.confirmations >= t.required:
                                 # Enforce minimum time between instructions
-                                try:
-                                    from datetime import datetime
-                                    if self.last_instruction_time:
-                                        elapsed = (datetime.now() - self.last_instruction_time).total_seconds()
-                                        if elapsed < self.min_instruction_interval:
-                                            logger.debug(f"Arrived but waiting min interval ({elapsed:.1f}s)")
-                                            continue
-                                except Exception:
-                                    pass
+                                if t.last_instruction_time is not None:
+                                    elapsed = current_time - t.last_instruction_time
+                                    if elapsed < t.min_interval:
+                                        logger.debug("Arrived but waiting min interval (%.1fs)", elapsed)
+                                        continue
                                 
                                 logger.info(f"✅ Confirmed arrival at waypoint (distance: {distance_to_wp:.1f}m) -> advancing to next instruction")
                                 if self.navigation_service.advance_to_next_instruction():
+                                    self._motion_state = 'moving'
                                     self.last_announced_instruction = None
+                                    t.last_step_id = -1
                                     self._announce_current_instruction()
                                     # reset last-distance to require leaving new waypoint area
-                                    self._last_distance_to_waypoint = None
-                                    self.arrival_confirmations = 0  # Reset counter
+                                    t.last_distance = None
+                                    t.confirmations = 0  # Reset counter
                                 else:
                                     self._handle_destination_reached()
                                     break
                         else:
                             # Not at waypoint or not getting closer - reset arrival counter
-                            if self.arrival_confirmations > 0:
-                                logger.debug(f"Resetting arrival confirmations (was {self.arrival_confirmations})")
-                            self.arrival_confirmations = 0
+                            if t.confirmations > 0:
+                                logger.debug("Resetting arrival confirmations (was %d)", t.confirmations)
+                                if self._motion_state == 'arrived_pending':
+                                    self._motion_state = 'moving'
+                            t.confirmations = 0
                 
             except Exception as e:
                 logger.error(f"Error in navigation monitoring: {str(e)}")
@@ -705,6 +965,7 @@ class NavigationController:
         """Handle reaching the destination"""
         try:
             self.is_navigating = False
+            self.instruction_event.set()  # Let push listeners observe the end
             
             destination_name = self.current_destination['name'] if self.current_destination else "your destination"
             
@@ -742,6 +1003,7 @@ class NavigationController:
             
             if self.navigation_service.advance_to_next_instruction():
                 self.last_announced_instruction = None  # Clear duplicate check for new instruction
+                self._arrival.last_step_id = -1
                 self._announce_current_instruction()
             else:
                 self._handle_destination_reached()
@@ -831,24 +1093,40 @@ class NavigationController:
         """Stop current navigation"""
         logger.info("Stopping navigation and clearing all state")
         self.is_navigating = False
+        self.instruction_event.set()  # Let push listeners observe the stop
         self.current_destination = None
-        self.last_instruction_time = None
         self.last_announced_instruction = None
+        self._arrival.reset()
         self.last_known_location = None
         
         # Clear search state to allow new searches
         self.waiting_for_selection = False
         self.search_results = []
         
-        # Clear navigation service state
-        if hasattr(self, 'navigation_service'):
-            self.navigation_service.current_route = None
-            self.navigation_service.current_step_index = 0
+        # Clear navigation service state (__slots__ guarantees the service
+        # attributes exist on any constructed instance, so no hasattr probe)
+        self.navigation_service.current_route = None
+        self.navigation_service.current_step_index = 0
+        self._wp_lats = None
+        self._wp_lons = None
+        self._route_lats = None
+        self._route_lngs = None
+        self._route_wp_end_idx = None
+        self._dist_buf = None
+        self._off_route_confirmations = 0
+        self._kf_lat = None
+        self._kf_lng = None
+        self._kf_p = 1.0
+        self._motion_state = 'idle'
+        self._move_deltas.clear()
+        self._prev_fix = None
+        self._reroute_inflight = False
         
         self.stop_location_simulation()  # Stop simulation if running
         
-        if self.navigation_thread and self.navigation_thread.is_alive():
-            self.navigation_thread.join(timeout=2)
+        # Nudge the persistent monitor so it sees is_navigating=False and
+        # parks promptly instead of waiting out its current interval
+        self._loc_updated.set()
         
         logger.info("Navigation state cleared completely")
     
@@ -881,6 +1159,7 @@ class NavigationController:
             # Manually trigger next instruction (like reaching a waypoint)
             if self.navigation_service.advance_to_next_instruction():
                 self.last_announced_instruction = None
+                self._arrival.last_step_id = -1
                 self._announce_current_instruction()
             else:
                 # Reached destination
@@ -904,6 +1183,7 @@ class NavigationController:
             
             if self.navigation_service.advance_to_next_instruction():
                 self.last_announced_instruction = None
+                self._arrival.last_step_id = -1
                 self._announce_current_instruction()
                 return True
             else:
@@ -926,67 +1206,120 @@ class NavigationController:
                 return
             
             # Check if user is significantly off the current route
-            if self._is_user_off_route(current_location):
+            if self._is_user_off_route(self._filter_location(current_location)):
+                if self._reroute_inflight:
+                    logger.debug("Reroute already in progress; skipping")
+                    return
+                self._reroute_inflight = True
                 logger.info("User appears to be off route, auto-rerouting...")
                 self.speech_service.speak("Recalculating route...", priority="high")
-                
-                # Get new route from current location to destination (use current routing mode)
-                route = self.navigation_service.get_directions(
-                    current_location, 
-                    self.current_destination['location'], 
-                    profile=self.routing_mode
-                )
-                
-                if route:
-                    # Update cache with new route (include routing mode)
-                    self.cache_service.cache_route(current_location, self.current_destination['location'], route, profile=self.routing_mode)
-                    
-                    # Reset navigation state to beginning of new route
-                    self.navigation_service.current_route = route
-                    self.navigation_service.current_step_index = 0
-                    self.last_announced_instruction = None
-                    
-                    # Announce new route
-                    summary = self.navigation_service.get_route_summary(route)
-                    if summary:
-                        self.speech_service.speak(f"New route calculated. {summary}")
-                    
-                    # Announce first instruction of new route
-                    self._announce_current_instruction()
-                    
-                    logger.info("Auto-reroute completed successfully")
-                else:
-                    logger.warning("Auto-reroute failed - could not calculate new route")
+                # Fetch the new route off the monitor thread so arrival
+                # checks and announcements keep running during the HTTP
+                # round trip; the in-flight flag stops checks from stacking
+                self._io_pool.submit(self._fetch_and_apply_reroute, current_location)
             
         except Exception as e:
             logger.error(f"Error in auto-rerouting: {str(e)}")
     
+    def _fetch_and_apply_reroute(self, current_location: Dict) -> None:
+        """Fetch a fresh route and swap it in; runs on the I/O pool."""
+        try:
+            route = self.navigation_service.get_directions(
+                current_location, 
+                self.current_destination['location'], 
+                profile=self.routing_mode
+            )
+            
+            if not self.is_navigating or not self.current_destination:
+                return  # navigation stopped while the fetch was in flight
+            
+            if route:
+                # Update cache with new route (include routing mode)
+                self._cache_pool.submit(self.cache_service.cache_route,
+                                        current_location, self.current_destination['location'],
+                                        route, profile=self.routing_mode)
+                
+                # Reset navigation state to beginning of new route
+                self.navigation_service.current_route = route
+                self.navigation_service.current_step_index = 0
+                self._build_waypoint_arrays(route)
+                self.last_announced_instruction = None
+                self._arrival.last_step_id = -1
+                
+                # Announce new route
+                summary = self.navigation_service.get_route_summary(route)
+                if summary:
+                    self.speech_service.speak(f"New route calculated. {summary}")
+                
+                # Announce first instruction of new route
+                self._announce_current_instruction()
+                
+                logger.info("Auto-reroute completed successfully")
+            else:
+                logger.warning("Auto-reroute failed - could not calculate new route")
+        except Exception as e:
+            logger.error(f"Error applying reroute: {str(e)}")
+        finally:
+            self._reroute_inflight = False
+    
     def _is_user_off_route(self, current_location: Dict) -> bool:
-        """Check if user is significantly off the current route"""
+        """Check if user is significantly off the current route.
+
+        Measures perpendicular (cross-track) deviation from the nearest
+        route segment rather than distance to the next instruction point,
+        so walking a long straight leg never reads as off-route just
+        because the next turn is far away. A reroute needs the deviation
+        sustained over consecutive checks to survive single bad fixes.
+        """
         try:
             if not self.navigation_service.current_route:
                 return False
-            
-            # Get the next waypoint from current route
-            next_waypoint = self._get_next_instruction_location()
-            if not next_waypoint:
+
+            deviation = None
+            route_lats = self._route_lats
+            if route_lats is not None and route_lats.shape[0] >= 2:
+                lat, lng = current_location['lat'], current_location['lng']
+                d = geo_numba.haversine_batch(lat, lng, route_lats,
+                                              self._route_lngs, out=self._dist_buf)
+                j = int(np.argmin(d))
+                # Cross-track against the polyline segment at the nearest
+                # vertex (the one ending there when it's the last vertex)
+                a = j if j + 1 < route_lats.shape[0] else j - 1
+                d_xt = geo_numba.cross_track_m(
+                    float(route_lats[a]), float(self._route_lngs[a]),
+                    float(route_lats[a + 1]), float(self._route_lngs[a + 1]),
+                    lat, lng
+                )
+                # The great circle extends past the segment ends; the
+                # nearest-vertex distance caps the deviation there
+                deviation = min(abs(d_xt), float(d[j]))
+            else:
+                # No geometry arrays (degenerate route): fall back to
+                # straight-line distance to the next instruction point
+                next_waypoint = self._get_next_instruction_location()
+                if next_waypoint:
+                    deviation = self._calculate_distance(
+                        current_location['lat'], current_location['lng'],
+                        next_waypoint['lat'], next_waypoint['lng']
+                    ) - 70.0  # old 100 m threshold minus the 30 m below
+
+            if deviation is None:
                 return False
-            
-            # Calculate distance to next waypoint
-            distance_to_waypoint = self._calculate_distance(
-                current_location['lat'], current_location['lng'],
-                next_waypoint['lat'], next_waypoint['lng']
-            )
-            
-            # If user is more than 100 meters from the next waypoint, consider them off route
-            off_route_threshold = 100.0  # meters
-            is_off_route = distance_to_waypoint > off_route_threshold
-            
-            if is_off_route:
-                logger.info(f"User is {distance_to_waypoint:.1f}m from next waypoint (threshold: {off_route_threshold}m)")
-            
-            return is_off_route
-            
+
+            if deviation > self.off_route_threshold:
+                self._off_route_confirmations += 1
+                logger.info(
+                    "Off-route deviation %.1fm (confirmation %d/%d)",
+                    deviation, self._off_route_confirmations,
+                    self.required_off_route_confirmations
+                )
+                if self._off_route_confirmations >= self.required_off_route_confirmations:
+                    self._off_route_confirmations = 0
+                    return True
+            elif self._off_route_confirmations > 0:
+                self._off_route_confirmations = 0
+            return False
+
         except Exception as e:
             logger.error(f"Error checking if user is off route: {str(e)}")
             return False
@@ -1015,12 +1348,16 @@ class NavigationController:
             
             if route:
                 # Update cache with new route (include routing mode)
-                self.cache_service.cache_route(current_location, self.current_destination['location'], route, profile=self.routing_mode)
+                self._cache_pool.submit(self.cache_service.cache_route,
+                                        current_location, self.current_destination['location'],
+                                        route, profile=self.routing_mode)
                 
                 # Reset navigation state to beginning of new route
                 self.navigation_service.current_route = route
                 self.navigation_service.current_step_index = 0
+                self._build_waypoint_arrays(route)
                 self.last_announced_instruction = None
+                self._arrival.last_step_id = -1
                 
                 # Announce new route
                 summary = self.navigation_service.get_route_summary(route)
@@ -1051,8 +1388,22 @@ class NavigationController:
     
     def _handle_unknown_command(self, command: Dict) -> None:
         """Handle unknown command"""
+        raw_command = command.get('raw_command', '')
+        
+        # 'clear' anywhere in an unrecognized command still clears state
+        # (previously a substring special case in the dispatch chain)
+        if 'clear' in raw_command.lower():
+            return self._handle_clear_navigation()
+        
+        # Text-only fallback for navigation (lowest priority)
+        if self.text_only_mode:
+            destination = raw_command.strip()
+            if destination:
+                logger.info(f"Text-only fallback: navigating to '{destination}'")
+                return self._handle_navigate_command({'destination': destination})
+        
         self.speech_service.speak(
-            f"I didn't understand '{command['raw_command']}'. "
+            f"I didn't understand '{raw_command}'. "
             "Please try again or say 'help' for available commands."
         )
     
@@ -1110,29 +1461,82 @@ class NavigationController:
             Distance in meters
         """
         try:
-            # Convert to radians
-            lat1_rad = math.radians(lat1)
-            lng1_rad = math.radians(lng1)
-            lat2_rad = math.radians(lat2)
-            lng2_rad = math.radians(lng2)
+            # Degrees to radians via one multiply, x*x instead of x**2,
+            # and the doubled Earth radius folded into one constant
+            lat1_rad = lat1 * _DEG2RAD
+            lat2_rad = lat2 * _DEG2RAD
             
-            # Haversine formula
-            dlat = lat2_rad - lat1_rad
-            dlng = lng2_rad - lng1_rad
+            sin_dlat = _sin((lat2_rad - lat1_rad) * 0.5)
+            sin_dlng = _sin((lng2 - lng1) * _DEG2RAD * 0.5)
             
-            a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlng/2)**2
-            c = 2 * math.asin(math.sqrt(a))
-            
-            # Earth radius in meters
-            earth_radius = 6371000
-            distance = earth_radius * c
-            
-            return distance
+            a = sin_dlat * sin_dlat + _cos(lat1_rad) * _cos(lat2_rad) * sin_dlng * sin_dlng
+            return _TWO_R * _asin(_sqrt(a))
             
         except Exception as e:
             logger.error(f"Error calculating distance: {str(e)}")
             return float('inf')
     
+    def _build_waypoint_arrays(self, route: Optional[Dict]) -> None:
+        """
+        Resolve each instruction's end coordinate once into parallel
+        float64 arrays so the monitor loop indexes precomputed buffers
+        instead of re-walking way_points/geometry dicts every tick
+        """
+        self._wp_lats = None
+        self._wp_lons = None
+        self._route_lats = None
+        self._route_lngs = None
+        self._route_wp_end_idx = None
+        self._dist_buf = None
+        try:
+            if not route or not route.get('instructions'):
+                return
+            instructions = route['instructions']
+            geometry = route.get('geometry') or {}
+            coordinates = geometry.get('coordinates') or []
+            waypoints = route.get('waypoints') or []
+            n = len(instructions)
+            lats = np.empty(n, dtype=np.float64)
+            lons = np.empty(n, dtype=np.float64)
+            # Geometry index where each instruction ends (-1 when the
+            # coordinate came from a waypoint/fallback, not the polyline)
+            end_idx = np.full(n, -1, dtype=np.int64)
+            for i, instruction in enumerate(instructions):
+                coord = None
+                # Same resolution order as _get_next_instruction_location:
+                # instruction end point -> route waypoint -> geometry fallback
+                way_points = (instruction or {}).get('way_points')
+                if way_points and len(way_points) >= 2 and way_points[1] < len(coordinates):
+                    coord = coordinates[way_points[1]]
+                    end_idx[i] = way_points[1]
+                elif waypoints and i < len(waypoints):
+                    location = waypoints[min(i, len(waypoints) - 1)].get('location', [])
+                    if len(location) >= 2:
+                        coord = location
+                if coord is None and coordinates:
+                    coord = coordinates[min(i * 10, len(coordinates) - 1)]
+                if coord is None:
+                    return  # leave arrays unset; the per-tick fallback still works
+                lats[i] = coord[1]  # OSRM uses [lng, lat]
+                lons[i] = coord[0]
+            self._wp_lats = lats
+            self._wp_lons = lons
+            self._route_wp_end_idx = end_idx
+            if coordinates:
+                geom = np.asarray(coordinates, dtype=np.float64)  # [lng, lat] rows
+                self._route_lats = np.ascontiguousarray(geom[:, 1])
+                self._route_lngs = np.ascontiguousarray(geom[:, 0])
+                # Reused by every batch distance call over this route
+                self._dist_buf = np.empty(len(coordinates), dtype=np.float64)
+        except Exception as e:
+            logger.error(f"Error building waypoint arrays: {str(e)}")
+            self._wp_lats = None
+            self._wp_lons = None
+            self._route_lats = None
+            self._route_lngs = None
+            self._route_wp_end_idx = None
+            self._dist_buf = None
+
     def _get_next_instruction_location(self) -> Optional[Dict]:
         """
         Get the location coordinates for the next navigation instruction
@@ -1141,6 +1545,14 @@ class NavigationController:
             Dict with lat/lng of next waypoint or None
         """
         try:
+            # Fast path: coordinates were resolved into arrays at route-set time
+            lats = self._wp_lats
+            if lats is not None:
+                i = self.navigation_service.current_step_index
+                if i < lats.shape[0]:
+                    return {'lat': float(lats[i]), 'lng': float(self._wp_lons[i])}
+                return None
+
             if not self.navigation_service.current_route:
                 return None
             
@@ -1189,16 +1601,98 @@ class NavigationController:
             logger.error(f"Error getting next instruction location: {str(e)}")
             return None
     
+    def _is_gps_spike(self, lat: float, lng: float) -> bool:
+        """Reject fixes that teleport away from the recent median position.
+
+        Compares each fix against the median of the last five accepted
+        ones: a median survives up to two bad samples where an average
+        would be dragged along by them. The distance budget scales with
+        time since the last fix (30 m/s covers vehicle speed), floored
+        at one second so rapid updates are not over-rejected. The first
+        five fixes pass unfiltered while the window fills.
+        """
+        history = self._fix_history
+        now = time.monotonic()
+        if len(history) == history.maxlen:
+            median_lat = sorted(t[1] for t in history)[2]
+            median_lng = sorted(t[2] for t in history)[2]
+            dt = max(now - history[-1][0], 1.0)
+            jump = geo_numba.equirect_m(median_lat, median_lng, lat, lng)
+            if jump > self._spike_speed_mps * dt:
+                logger.info("Rejected GPS spike %.0fm from recent median (dt=%.1fs)", jump, dt)
+                return True
+        history.append((now, lat, lng))
+        return False
+
+    def _track_motion(self, lat: float, lng: float) -> None:
+        """Update the motion state machine from one raw GPS fix.
+
+        Keeps a rolling window of hop distances between consecutive
+        fixes: one hop above the moving threshold means the user is
+        moving; a full window that sums to less than the idle threshold
+        means they are standing still. arrived_pending (set by the
+        monitor while arrival confirmations accumulate) is not demoted
+        to idle here - stopping at a waypoint is exactly when the
+        arrival checks must keep running.
+        """
+        prev = self._prev_fix
+        self._prev_fix = (lat, lng)
+        if prev is None:
+            return
+        delta = geo_numba.equirect_m(prev[0], prev[1], lat, lng)
+        self._move_deltas.append(delta)
+        if delta > self._moving_delta_m:
+            self._motion_state = 'moving'
+        elif (len(self._move_deltas) == self._move_deltas.maxlen
+              and sum(self._move_deltas) < self._idle_window_m
+              and self._motion_state != 'arrived_pending'):
+            self._motion_state = 'idle'
+
+    def _kf_update(self, lat: float, lng: float) -> None:
+        """Fold one GPS measurement into the smoothed position estimate.
+
+        Scalar Kalman update applied to lat and lng independently: the
+        estimate moves toward each fix by the gain K = P / (P + R), so a
+        single outlier shifts it only fractionally while consistent
+        movement converges within a few updates.
+        """
+        if self._kf_lat is None:
+            self._kf_lat = lat
+            self._kf_lng = lng
+            self._kf_p = 1.0
+            return
+        p = self._kf_p + self._kf_process_var
+        k = p / (p + self._kf_measurement_var)
+        self._kf_lat += k * (lat - self._kf_lat)
+        self._kf_lng += k * (lng - self._kf_lng)
+        self._kf_p = (1.0 - k) * p
+
+    def _filter_location(self, location: Optional[Dict]) -> Optional[Dict]:
+        """Return the location with lat/lng replaced by the smoothed
+        estimate, or unchanged when the filter has not been seeded.
+
+        Simulated fixes bypass the controller's set_current_location and
+        never feed the filter, so simulation mode reads the raw location:
+        otherwise every distance would be frozen at whatever estimate the
+        last real fix left behind. Simulated movement is noiseless anyway.
+        """
+        if location is None or self._kf_lat is None or self.simulation_mode:
+            return location
+        return {**location, 'lat': self._kf_lat, 'lng': self._kf_lng}
+
     def _distance_to_next_waypoint(self) -> Optional[float]:
         """Compute distance in meters to the end of the current instruction."""
         try:
-            current_location = self.location_service.get_current_location()
+            current_location = self._filter_location(
+                self.location_service.get_current_location())
             if not current_location:
                 return None
             next_waypoint = self._get_next_instruction_location()
             if not next_waypoint:
                 return None
-            return self._calculate_distance(
+            # Equirectangular is plenty at waypoint scale and much cheaper
+            # than Haversine for a call that fires every monitor tick
+            return geo_numba.equirect_m(
                 current_location['lat'], current_location['lng'],
                 next_waypoint['lat'], next_waypoint['lng']
             )
@@ -1214,7 +1708,8 @@ class NavigationController:
             True if location has changed by more than the threshold
         """
         try:
-            current_location = self.location_service.get_current_location()
+            current_location = self._filter_location(
+                self.location_service.get_current_location())
             if not current_location:
                 return False
             
@@ -1223,18 +1718,23 @@ class NavigationController:
                 self.last_known_location = current_location.copy()
                 return False  # First time, do not consider it a change
             
-            # Calculate distance moved since last check
-            distance_moved = self._calculate_distance(
-                self.last_known_location['lat'], self.last_known_location['lng'],
-                current_location['lat'], current_location['lng']
-            )
+            # Compare squared equirectangular distance (in degrees of arc)
+            # against the precomputed squared threshold: same decision as the
+            # metric form without the sqrt
+            dlat = current_location['lat'] - self.last_known_location['lat']
+            dlon = (current_location['lng'] - self.last_known_location['lng']) * \
+                math.cos(math.radians(current_location['lat']))
+            dist_deg_sq = dlat * dlat + dlon * dlon
             
-            logger.debug(f"Location change: {distance_moved:.1f}m (threshold: {self.location_change_threshold}m)")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Location change: %.1fm (threshold: %sm)",
+                             math.sqrt(dist_deg_sq) * geo_numba.DEG_TO_M,
+                             self.location_change_threshold)
             
-            if distance_moved >= self.location_change_threshold:
+            if dist_deg_sq >= self._loc_change_threshold_deg_sq:
                 self.last_known_location = current_location.copy()
                 try:
-                    self.last_movement_time = time.time()
+                    self.last_movement_time = time.monotonic()
                 except Exception:
                     pass
                 return True
@@ -1255,7 +1755,7 @@ class NavigationController:
                 return
             
             self.simulation_mode = True
-            self.last_simulation_update = time.time()
+            self.last_simulation_update = time.monotonic()
             logger.info("Started location simulation for testing navigation")
             
         except Exception as e:
@@ -1269,7 +1769,7 @@ class NavigationController:
             if not self.simulation_mode or not self.is_navigating:
                 return
             
-            current_time = time.time()
+            current_time = time.monotonic()
             if not self.last_simulation_update:
                 self.last_simulation_update = current_time
                 return
@@ -1282,7 +1782,7 @@ class NavigationController:
             
             if current_location and next_waypoint:
                 # Calculate direction to next waypoint
-                current_distance = self._calculate_distance(
+                current_distance = geo_numba.equirect_m(
                     current_location['lat'], current_location['lng'],
                     next_waypoint['lat'], next_waypoint['lng']
                 )
@@ -1296,7 +1796,7 @@ class NavigationController:
                     
                     # Update location
                     self.location_service.set_current_location(new_lat, new_lng)
-                    logger.debug(f"Simulated location updated to: {new_lat:.6f}, {new_lng:.6f}")
+                    logger.debug("Simulated location updated to: %.6f, %.6f", new_lat, new_lng)
             
             self.last_simulation_update = current_time
             
@@ -11,8 +11,10 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 class GooglePlacesService:
-    def __init__(self, api_key: str):
-        self.client = googlemaps.Client(key=api_key)
+    def __init__(self, api_key: str, requests_session=None):
+        # An optional caller-provided session (e.g. a caching session) lets
+        # repeated Places lookups skip the network entirely.
+        self.client = googlemaps.Client(key=api_key, requests_session=requests_session)
         logger.info("Initialized Google Places Service")
     
     def _is_in_uae_region(self, location: Dict) -> bool:
@@ -50,7 +50,14 @@ class LocationService:
             Dict with lat/lng or None if not set
         """
         return self.current_location
-    
+
+    def clear(self) -> None:
+        """
+        Forget the current location (used when a pooled controller is
+        recycled so a new session never sees another user's position)
+        """
+        self.current_location = None
+
     def reverse_geocode(self, latitude: float, longitude: float) -> Optional[str]:
         """
         Convert coordinates to address